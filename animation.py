@@ -0,0 +1,170 @@
+# ============================================================
+# animation.py — Non-Blocking Turn Animation
+# ============================================================
+#
+# A turn is split in two:
+#   * TurnProducer runs one simulate_turn call (all 10 days, in place)
+#     in a background thread and queues each day's change list and
+#     counts as soon as that day is done
+#   * animate_turn replays those changes onto its own copy of the
+#     pre-turn grid on a time budget while still pumping events, so
+#     the window never freezes
+#
+# Keys while a turn plays:
+#   SPACE / ESC  skip to the end of the turn
+#   F            toggle fast-forward
+
+import sys
+import queue
+import threading
+import pygame
+import numpy as np
+from config import *
+from profiler import PROFILER
+from scene import handle_profiler_keys
+from bytegrid import copy_grid
+from simulation import apply_changes
+
+
+def _merge_changes(batches):
+    if batches and hasattr(batches[0], "shape"):
+        return np.concatenate(batches)
+    return [cell for batch in batches for cell in batch]
+
+
+class TurnProducer:
+    """
+    Runs turn(grid, *args, days=days, tally=tally, on_day=...) off the
+    main thread, where turn is one of the simulate_turn functions. Each
+    queued frame is (changes, counts) for one day. `before` is the
+    only grid copy made: the state the animator starts replaying from.
+    If a savegame.HistoryWriter is given every day is appended to it,
+    and if a timeseries.TimeSeries is given every day's counts.
+    """
+
+    def __init__(self, turn, grid, args, days=10, tally=None, history=None,
+                 series=None):
+        self.turn = turn
+        self.history = history
+        self.series = series
+        self.grid = grid
+        self.before = copy_grid(grid)
+        self.args = args
+        self.days = days
+        self.tally = tally
+        self.frames = queue.Queue()
+        self.error = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _on_day(self, counts, changes):
+        if self.history is not None:
+            self.history.append_changes(changes)
+        if self.series is not None:
+            self.series.append(counts)
+        self.frames.put((changes, counts))
+
+    def _run(self):
+        try:
+            with PROFILER.span("simulate", self.days):
+                self.turn(self.grid, *self.args, days=self.days,
+                          tally=self.tally, on_day=self._on_day)
+        except BaseException as exc:
+            self.error = exc
+        finally:
+            self.frames.put(None)
+
+    def result(self):
+        """Wait for the producer and return the grid (updated in place)."""
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.grid
+
+
+# ------------------------------------------------------------
+# Time-budgeted animator
+# ------------------------------------------------------------
+def animate_turn(screen, renderer, producer, hospitals, quarantines,
+                 draw_sidebar=None, day_ms=DAY_ANIM_MS, fps=FPS_CAP,
+                 camera=None):
+    """
+    Show each simulated day for `day_ms` (divided by FAST_FORWARD when
+    fast-forwarding). draw_sidebar(counts, days_done) is called on every
+    new frame. If a camera is given it can be panned / zoomed while the
+    turn plays. Returns the final grid once the turn has fully played.
+    """
+    clock = pygame.time.Clock()
+    fast = False
+    skip = False
+    elapsed = 0
+
+    shown = 0              # days currently on screen
+    received = []          # frames pulled from the producer so far
+    finished = False
+    display = producer.before
+
+    # Tiles changed since the last frame outside the simulation (start
+    # click, vaccine, hospital) are not in any day's change list
+    renderer.update(display)
+
+    while True:
+        moved = False
+
+        # ---- events ----
+        with PROFILER.span("events"):
+            for e in pygame.event.get():
+                if e.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if handle_profiler_keys(e):
+                    continue
+                if camera is not None and camera.handle_event(e):
+                    moved = True
+                if e.type == pygame.KEYDOWN:
+                    if e.key in (pygame.K_SPACE, pygame.K_ESCAPE):
+                        skip = True
+                    elif e.key == pygame.K_f:
+                        fast = not fast
+
+        # ---- collect finished days ----
+        while not finished:
+            try:
+                frame = producer.frames.get_nowait()
+            except queue.Empty:
+                break
+            if frame is None:
+                finished = True
+            else:
+                received.append(frame)
+
+        # ---- which day should be on screen now ----
+        if skip:
+            target = len(received)
+        else:
+            target = min(len(received), elapsed // day_ms)
+
+        if target > shown or (moved and shown > 0):
+            batches = [changes for changes, _ in received[shown:target]]
+            for changes in batches:
+                apply_changes(display, changes)
+            with PROFILER.span("draw_grid"):
+                renderer.draw(screen, display, hospitals, quarantines,
+                              _merge_changes(batches))
+
+            counts = received[target - 1][1]
+            if draw_sidebar is not None:
+                draw_sidebar(counts, target)
+            pygame.display.flip()
+            PROFILER.end_frame()
+            shown = target
+
+        if finished and shown == len(received):
+            return producer.result()
+
+        with PROFILER.span("wait"):
+            dt = clock.tick(fps)
+        elapsed += dt * (FAST_FORWARD if fast else 1)
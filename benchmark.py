@@ -0,0 +1,322 @@
+# ============================================================
+# benchmark.py — Headless Timing Suite for the Hot Paths
+# ============================================================
+#
+# Times the simulation (one day, one 10-day turn), rendering (full
+# frame, idle frame), the player tools and the stats / end-condition
+# checks over several map sizes and infection densities. Grids are
+# built from fixed seeds, so two runs on different commits measure
+# the same work. Results are written as JSON; pass --compare to diff
+# against an earlier file.
+#
+#   python benchmark.py --out before.json
+#   python benchmark.py --out after.json --compare before.json
+
+import os
+
+# No display / audio needed — must be set before pygame is imported
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+
+import numpy as np
+import pygame
+
+from config import *
+from grid_logic import (simulate_day, simulate_turn, check_end_conditions,
+                        GridRenderer, draw_grid)
+from frontier import ActiveFrontier, simulate_day_sparse, simulate_turn_sparse
+from vector_sim import simulate_day_array, simulate_turn_array
+from tools import place_vaccine, place_quarantine, place_hospital
+from coverage import CoverageIndex
+from population import PopulationTally
+from camera import Camera
+from sim_rng import SimRandom
+from bytegrid import ByteGrid
+
+
+DEFAULT_SIZES = "40x60,300x450,1000x1000"
+DEFAULT_DENSITIES = "0.001,0.05,0.3"
+
+DAY_STEPS = {
+    "python": simulate_day,
+    "sparse": simulate_day_sparse,
+    "numpy": simulate_day_array,
+}
+
+TURN_STEPS = {
+    "python": simulate_turn,
+    "sparse": simulate_turn_sparse,
+    "numpy": simulate_turn_array,
+}
+
+
+# ------------------------------------------------------------
+# Fixed-seed test grids
+# ------------------------------------------------------------
+def make_state(rows, cols, density, seed=0):
+    """
+    A mid-outbreak map: `density` of the tiles infected, a few
+    recovered / dead, plus one hospital and one quarantine zone.
+    Returns (array grid, hospitals, quarantines).
+    """
+    rng = np.random.default_rng(seed)
+    rolls = rng.random((rows, cols))
+    grid = np.full((rows, cols), SUS, dtype=np.uint8)
+    grid[rolls < density] = INF
+    grid[(rolls >= density) & (rolls < density * 1.5)] = REC
+    grid[(rolls >= density * 1.5) & (rolls < density * 1.7)] = DED
+
+    hospitals = [(rows // 3, cols // 3)]
+    quarantines = [(2 * rows // 3, 2 * cols // 3)]
+    return grid, hospitals, quarantines
+
+
+def as_engine_grid(grid, engine):
+    return grid.copy() if engine == "numpy" else ByteGrid.from_array(grid)
+
+
+# ------------------------------------------------------------
+# Timer
+# ------------------------------------------------------------
+def time_call(fn, setup=None, repeat=5):
+    """
+    Run fn(setup()) `repeat` times (setup is not timed) and return
+    best / median wall time in milliseconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        fn(arg)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"best_ms": min(samples), "median_ms": statistics.median(samples),
+            "repeat": repeat}
+
+
+# ------------------------------------------------------------
+# Benchmarks (each yields result dicts)
+# ------------------------------------------------------------
+def bench_sim(grid, hospitals, quarantines, engines, repeat, seed):
+    rows, cols = grid.shape
+    for engine in engines:
+        if engine == "python" and rows * cols > PYTHON_ENGINE_MAX_CELLS:
+            continue
+
+        coverage = CoverageIndex.from_structures(rows, cols, hospitals, quarantines)
+
+        def setup():
+            g = as_engine_grid(grid, engine)
+            extra = {"frontier": ActiveFrontier(g)} if engine == "sparse" else {}
+            return g, PopulationTally.from_array(grid), extra
+
+        def day(state):
+            g, tally, extra = state
+            DAY_STEPS[engine](g, 1.0, hospitals, quarantines, coverage,
+                              tally=tally, rng=SimRandom(seed), **extra)
+
+        def turn(state):
+            g, tally, extra = state
+            TURN_STEPS[engine](g, 1.0, hospitals, quarantines, days=10,
+                               coverage=coverage, tally=tally,
+                               rng=SimRandom(seed), **extra)
+
+        yield {"bench": "sim.day", "engine": engine, **time_call(day, setup, repeat)}
+        yield {"bench": "sim.turn", "engine": engine, **time_call(turn, setup, repeat)}
+
+
+def bench_render(grid, hospitals, quarantines, repeat):
+    rows, cols = grid.shape
+    screen = pygame.display.get_surface()
+
+    for mode, vectorized in (("dirty", False), ("surfarray", True)):
+        camera = Camera(rows, cols)
+        renderer = GridRenderer(camera, vectorized=vectorized)
+
+        def full(_):
+            renderer.invalidate()
+            renderer.draw(screen, grid, hospitals, quarantines)
+
+        def idle(_):
+            renderer.draw(screen, grid, hospitals, quarantines)
+
+        renderer.draw(screen, grid, hospitals, quarantines)
+        yield {"bench": "render.full", "engine": mode, **time_call(full, repeat=repeat)}
+        yield {"bench": "render.idle", "engine": mode, **time_call(idle, repeat=repeat)}
+
+    # The original whole-map redraw, only where it fits on screen
+    if rows == GRID_ROWS and cols == GRID_COLS:
+        coverage = CoverageIndex.from_structures(rows, cols, hospitals, quarantines)
+        g = grid.tolist()
+        yield {"bench": "render.draw_grid", "engine": "python",
+               **time_call(lambda _: draw_grid(screen, g, hospitals, quarantines,
+                                               coverage), repeat=repeat)}
+
+
+def bench_tools(grid, repeat):
+    rows, cols = grid.shape
+    r, c = rows // 2, cols // 2
+
+    for engine in ("list", "bytegrid", "numpy"):
+        def setup():
+            if engine == "list":
+                g = grid.tolist()
+            else:
+                g = as_engine_grid(grid, engine)
+            return g, PopulationTally.from_array(grid), CoverageIndex(rows, cols)
+
+        yield {"bench": "tool.vaccine", "engine": engine,
+               **time_call(lambda s: place_vaccine(s[0], r, c, s[1]), setup, repeat)}
+        yield {"bench": "tool.quarantine", "engine": engine,
+               **time_call(lambda s: place_quarantine([], r, c, s[2]), setup, repeat)}
+        yield {"bench": "tool.hospital", "engine": engine,
+               **time_call(lambda s: place_hospital(s[0], [], r, c, s[2], s[1]),
+                           setup, repeat)}
+
+
+def bench_stats(grid, repeat):
+    g = grid.tolist()
+    b = ByteGrid.from_array(grid)
+    tally = PopulationTally.from_array(grid)
+    yield {"bench": "stats.scan", "engine": "python",
+           **time_call(lambda _: check_end_conditions(g), repeat=repeat)}
+    yield {"bench": "stats.scan", "engine": "bytegrid",
+           **time_call(lambda _: check_end_conditions(b), repeat=repeat)}
+    yield {"bench": "stats.tally", "engine": "python",
+           **time_call(lambda _: check_end_conditions(g, tally), repeat=repeat)}
+
+
+# ------------------------------------------------------------
+# Suite
+# ------------------------------------------------------------
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(sizes, densities, engines=("python", "sparse", "numpy"),
+              repeat=5, seed=0, groups=("sim", "render", "tools", "stats")):
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    results = []
+    for rows, cols in sizes:
+        for density in densities:
+            grid, hospitals, quarantines = make_state(rows, cols, density, seed)
+            case = {"rows": rows, "cols": cols, "density": density}
+
+            runs = []
+            if "sim" in groups:
+                runs.append(bench_sim(grid, hospitals, quarantines, engines,
+                                      repeat, seed))
+            if "render" in groups:
+                runs.append(bench_render(grid, hospitals, quarantines, repeat))
+            if "tools" in groups:
+                runs.append(bench_tools(grid, repeat))
+            if "stats" in groups:
+                runs.append(bench_stats(grid, repeat))
+
+            for run in runs:
+                for res in run:
+                    results.append({**case, **res})
+                    print(f"{res['bench']:<18}{res['engine']:<10}{rows:>5}x{cols:<5}"
+                          f"{density:>7.3f}{res['best_ms']:>11.3f} ms")
+
+    pygame.quit()
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def _key(res):
+    return (res["bench"], res["engine"], res["rows"], res["cols"], res["density"])
+
+
+def compare(old, new, threshold=0.10):
+    """Print best-time ratios new/old; flag changes beyond `threshold`."""
+    before = {_key(r): r for r in old["results"]}
+    print(f"\n{'bench':<18}{'engine':<10}{'size':>11}{'density':>8}"
+          f"{'old ms':>11}{'new ms':>11}{'ratio':>8}")
+    for res in new["results"]:
+        prev = before.get(_key(res))
+        if prev is None:
+            continue
+        ratio = res["best_ms"] / prev["best_ms"] if prev["best_ms"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  slower"
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        size = f"{res['rows']}x{res['cols']}"
+        print(f"{res['bench']:<18}{res['engine']:<10}{size:>11}{res['density']:>8.3f}"
+              f"{prev['best_ms']:>11.3f}{res['best_ms']:>11.3f}{ratio:>8.2f}{flag}")
+
+
+# ------------------------------------------------------------
+# ENTRY POINT
+# ------------------------------------------------------------
+def _parse_sizes(text):
+    sizes = []
+    for item in text.split(","):
+        if item in MAP_SIZES:
+            sizes.append(MAP_SIZES[item])
+        else:
+            rows, cols = item.lower().split("x")
+            sizes.append((int(rows), int(cols)))
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmark suite")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help="comma list of ROWSxCOLS or map names")
+    parser.add_argument("--densities", default=DEFAULT_DENSITIES)
+    parser.add_argument("--engines", default="python,sparse,numpy")
+    parser.add_argument("--groups", default="sim,render,tools,stats")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="benchmark.json")
+    parser.add_argument("--compare", help="earlier results file to diff against")
+    args = parser.parse_args()
+
+    report = run_suite(
+        _parse_sizes(args.sizes),
+        [float(d) for d in args.densities.split(",")],
+        engines=args.engines.split(","),
+        repeat=args.repeat,
+        seed=args.seed,
+        groups=args.groups.split(","),
+    )
+
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nwrote {len(report['results'])} results to {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
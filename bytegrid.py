@@ -0,0 +1,114 @@
+# ============================================================
+# bytegrid.py — One-Byte-Per-Tile Grid
+# ============================================================
+#
+# The list engines used to keep the map as a list of lists of Python
+# ints: 8 bytes of pointer per tile plus a list object per row, and
+# every copy rebuilt all of it. A ByteGrid keeps the whole map in one
+# bytearray instead, with a memoryview per row, so
+#
+#   grid[r][c]            reads / writes a tile exactly as before
+#   len(grid), grid[0]    rows and columns as before
+#   grid.copy()           is a single memcpy of rows * cols bytes
+#   grid.count(INF)       is a C-level bytes.count
+#   np.asarray(grid)      is a zero-copy (rows, cols) uint8 view
+#
+# The row views live in a list base class, so grid[r] and len(grid) in
+# the simulation's hot loops stay C-level list operations.
+#
+# The NumPy engine keeps using plain arrays (vector_sim.make_grid_array).
+
+import numpy as np
+from config import *
+
+
+class ByteGrid(list):
+    __slots__ = ("rows", "cols", "data")
+
+    def __init__(self, rows=GRID_ROWS, cols=GRID_COLS, fill=SUS, data=None):
+        self.rows = rows
+        self.cols = cols
+        if data is None:
+            self.data = bytearray([fill]) * (rows * cols)
+        else:
+            # bytearray(...) of a buffer is one memcpy
+            self.data = bytearray(data)
+            if len(self.data) != rows * cols:
+                raise ValueError(f"expected {rows * cols} bytes, got {len(self.data)}")
+
+        view = memoryview(self.data)
+        super().__init__(view[r * cols:(r + 1) * cols] for r in range(rows))
+
+    @classmethod
+    def from_array(cls, array):
+        array = np.ascontiguousarray(array, dtype=np.uint8)
+        rows, cols = array.shape
+        return cls(rows, cols, data=array)
+
+    @classmethod
+    def from_rows(cls, rows):
+        rows = list(rows)
+        cols = len(rows[0]) if rows else 0
+        return cls(len(rows), cols, data=b"".join(bytes(row) for row in rows))
+
+    # ---------------------------------------------------------
+    # Row access: grid[r] is a writable memoryview of row r
+    # ---------------------------------------------------------
+    def row(self, r):
+        return self[r]
+
+    def column(self, c):
+        """Copy of column c as bytes."""
+        return bytes(self.data[c::self.cols])
+
+    def set_column(self, c, values):
+        self.data[c::self.cols] = bytes(values)
+
+    # ---------------------------------------------------------
+    # Whole-grid operations
+    # ---------------------------------------------------------
+    def copy(self):
+        return ByteGrid(self.rows, self.cols, data=self.data)
+
+    def copy_from(self, other):
+        """Overwrite this grid with another of the same size, in place."""
+        self.data[:] = other.data if isinstance(other, ByteGrid) else bytes(other)
+
+    def count(self, state):
+        return self.data.count(state)
+
+    def state_counts(self):
+        """[S, I, R, D, Q] tile counts."""
+        return [self.data.count(state) for state in range(5)]
+
+    def array(self):
+        """Writable (rows, cols) uint8 view sharing this grid's memory."""
+        return np.frombuffer(self.data, dtype=np.uint8).reshape(self.rows, self.cols)
+
+    def __array__(self, dtype=None, copy=None):
+        view = self.array()
+        if copy:
+            view = view.copy()
+        return view if dtype is None else view.astype(dtype, copy=False)
+
+    def tolist(self):
+        return [list(row) for row in self]
+
+    def __eq__(self, other):
+        if isinstance(other, ByteGrid):
+            return (self.rows, self.cols, self.data) == (other.rows, other.cols, other.data)
+        return NotImplemented
+
+    # memoryviews do not pickle; rebuild from the raw bytes instead
+    def __reduce__(self):
+        return (ByteGrid, (self.rows, self.cols, SUS, bytes(self.data)))
+
+    def __repr__(self):
+        return f"ByteGrid({self.rows}x{self.cols})"
+
+
+def copy_grid(grid):
+    """Independent copy of a ByteGrid, NumPy array or list-of-lists grid."""
+    if isinstance(grid, list) and not isinstance(grid, ByteGrid):
+        return [row[:] for row in grid]
+    return grid.copy()
@@ -0,0 +1,172 @@
+# ============================================================
+# camera.py — Pannable, Zoomable Map Viewport
+# ============================================================
+#
+# The map can be far bigger than the window, so it is viewed through
+# a camera. The camera stores the top-left visible tile and a zoom
+# level, where a zoom level is (cell_px, block):
+#   * block == 1  -> every tile is cell_px x cell_px screen pixels
+#   * block  > 1  -> every block x block square of tiles is one pixel
+# Only the visible window is ever rendered, so rendering cost is
+# bounded by the screen size rather than the map size.
+#
+# Controls (handled by handle_event):
+#   mouse wheel / + -      zoom around the cursor
+#   arrows / WASD          pan
+#   right mouse drag       pan
+
+import pygame
+from config import *
+
+
+ZOOM_LEVELS = [
+    (1, 16), (1, 8), (1, 4), (1, 2),
+    (1, 1), (2, 1), (3, 1), (4, 1), (6, 1), (8, 1),
+    (10, 1), (15, 1), (20, 1), (30, 1),
+]
+
+PAN_KEYS = {
+    pygame.K_LEFT: (0, -1), pygame.K_a: (0, -1),
+    pygame.K_RIGHT: (0, 1), pygame.K_d: (0, 1),
+    pygame.K_UP: (-1, 0), pygame.K_w: (-1, 0),
+    pygame.K_DOWN: (1, 0), pygame.K_s: (1, 0),
+}
+
+
+class Camera:
+    def __init__(self, rows=GRID_ROWS, cols=GRID_COLS,
+                 view_w=VIEW_WIDTH, view_h=VIEW_HEIGHT):
+        self.rows = rows
+        self.cols = cols
+        self.view_w = view_w
+        self.view_h = view_h
+        self.top = 0
+        self.left = 0
+        self.level = self.fit_level()
+        self._drag = (0.0, 0.0)
+
+    # ---------------------------------------------------------
+    # Zoom helpers
+    # ---------------------------------------------------------
+    @property
+    def cell_px(self):
+        return ZOOM_LEVELS[self.level][0]
+
+    @property
+    def block(self):
+        return ZOOM_LEVELS[self.level][1]
+
+    @property
+    def cell_size(self):
+        """Screen pixels per tile (below 1 when zoomed out)."""
+        return self.cell_px / self.block
+
+    def fit_level(self):
+        """Closest zoom (capped at CELL_SIZE) that shows the whole map."""
+        best = 0
+        for i, (px, block) in enumerate(ZOOM_LEVELS):
+            if px > CELL_SIZE:
+                break
+            if self.cols * px <= self.view_w * block and self.rows * px <= self.view_h * block:
+                best = i
+        return best
+
+    def state(self):
+        """Hashable view key — changes whenever the picture moves."""
+        return (self.top, self.left, self.level)
+
+    # ---------------------------------------------------------
+    # Visible window and coordinate mapping
+    # ---------------------------------------------------------
+    def visible_cells(self):
+        """(r0, r1, c0, c1) tile range covering the viewport."""
+        span_r, span_c = self._span()
+        return (self.top, min(self.top + span_r, self.rows),
+                self.left, min(self.left + span_c, self.cols))
+
+    def cell_at(self, px, py):
+        """Tile under screen pixel (px, py), or None if off the map."""
+        if not (0 <= px < self.view_w and 0 <= py < self.view_h):
+            return None
+        r = self.top + py * self.block // self.cell_px
+        c = self.left + px * self.block // self.cell_px
+        if 0 <= r < self.rows and 0 <= c < self.cols:
+            return (r, c)
+        return None
+
+    def cell_to_screen(self, r, c):
+        """Screen pixel of the tile's top-left corner."""
+        return ((c - self.left) * self.cell_px // self.block,
+                (r - self.top) * self.cell_px // self.block)
+
+    # ---------------------------------------------------------
+    # Movement
+    # ---------------------------------------------------------
+    def _span(self):
+        """Tiles that fit in the viewport (rows, cols)."""
+        return (-(-self.view_h * self.block // self.cell_px),
+                -(-self.view_w * self.block // self.cell_px))
+
+    def clamp(self):
+        span_r, span_c = self._span()
+        self.top = max(0, min(self.top, self.rows - span_r))
+        self.left = max(0, min(self.left, self.cols - span_c))
+
+        # keep block-aligned so downsampled pixels never shimmer
+        self.top -= self.top % self.block
+        self.left -= self.left % self.block
+
+    def pan(self, d_rows, d_cols):
+        self.top += d_rows
+        self.left += d_cols
+        self.clamp()
+
+    def zoom(self, steps, px=None, py=None):
+        if px is None:
+            px, py = self.view_w // 2, self.view_h // 2
+
+        # keep the tile under the cursor in place
+        anchor_r = self.top + py * self.block / self.cell_px
+        anchor_c = self.left + px * self.block / self.cell_px
+
+        self.level = max(0, min(self.level + steps, len(ZOOM_LEVELS) - 1))
+
+        self.top = int(anchor_r - py * self.block / self.cell_px)
+        self.left = int(anchor_c - px * self.block / self.cell_px)
+        self.clamp()
+
+    def handle_event(self, e):
+        """Apply pan / zoom input. Returns True if the view may have moved."""
+        if e.type == pygame.MOUSEWHEEL:
+            mx, my = pygame.mouse.get_pos()
+            self.zoom(1 if e.y > 0 else -1, mx, my)
+            return True
+
+        if e.type == pygame.KEYDOWN:
+            if e.key in PAN_KEYS:
+                # an eighth of the view per press, in whole blocks
+                dr, dc = PAN_KEYS[e.key]
+                span_r, span_c = self._span()
+                step_r = max(span_r // 8 // self.block, 1) * self.block
+                step_c = max(span_c // 8 // self.block, 1) * self.block
+                self.pan(dr * step_r, dc * step_c)
+                return True
+            if e.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                self.zoom(1)
+                return True
+            if e.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                self.zoom(-1)
+                return True
+
+        if e.type == pygame.MOUSEMOTION and e.buttons[2]:
+            # accumulate small drags until they add up to a whole block
+            dr = self._drag[0] - e.rel[1] * self.block / self.cell_px
+            dc = self._drag[1] - e.rel[0] * self.block / self.cell_px
+            whole_r = int(dr / self.block) * self.block
+            whole_c = int(dc / self.block) * self.block
+            self._drag = (dr - whole_r, dc - whole_c)
+            if whole_r or whole_c:
+                self.pan(whole_r, whole_c)
+                return True
+
+        return False
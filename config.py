@@ -3,13 +3,25 @@
 # ============================================================
 
 # --- GRID SETTINGS ---
+# Default (Small) map; the map size is picked at game start
 GRID_ROWS = 40
 GRID_COLS = 60
 CELL_SIZE = 15
 
+# Map sizes offered on the settings screen: name -> (rows, cols)
+MAP_SIZES = {
+    "Small": (GRID_ROWS, GRID_COLS),
+    "Large": (300, 450),
+    "Huge": (1000, 1000),
+}
+
+# Map viewport (the camera shows part of the map here)
+VIEW_WIDTH = GRID_COLS * CELL_SIZE
+VIEW_HEIGHT = GRID_ROWS * CELL_SIZE
+
 # Screen dimensions
-SCREEN_WIDTH = GRID_COLS * CELL_SIZE + 260  # 260 for sidebar
-SCREEN_HEIGHT = GRID_ROWS * CELL_SIZE
+SCREEN_WIDTH = VIEW_WIDTH + 260  # 260 for sidebar
+SCREEN_HEIGHT = VIEW_HEIGHT
 
 
 
@@ -66,10 +78,48 @@ BASE_DEATH_RATE = 0.03
 
 # Hospitals give local recovery boost
 HOSPITAL_BOOST = 0.20
+HOSPITAL_REACH = 2        # 5x5 area around the hospital tile
 
 # Quarantine reduces spread
 QUARANTINE_REDUCTION = 0.40
+QUARANTINE_REACH = 1      # 3x3 area around the zone center
 
 # Vaccine radius
 VACCINE_RADIUS = 50
 
+
+# --- SIMULATION ENGINE ---
+# "python" = simulation.simulate_day (one cell at a time)
+# "numpy"  = vector_sim.simulate_day_array (whole grid in bulk)
+# "sparse" = frontier.simulate_day_sparse (only the active outbreak)
+SIM_ENGINE = "python"
+
+# Maps bigger than this always use the "numpy" engine instead of "python"
+PYTHON_ENGINE_MAX_CELLS = 10_000
+
+# --- GRID RENDERER ---
+# "dirty"     = repaint only the tiles that changed (rect per tile)
+# "surfarray" = palette lookup + one scale for the whole grid
+GRID_RENDERER = "dirty"
+
+# --- FRAME PACING ---
+FPS_CAP = 60          # max redraws per second in menus and popups
+IDLE_WAKE_MS = 250    # how often an idle scene re-checks its state
+
+# --- TURN ANIMATION ---
+DAY_ANIM_MS = 320     # time each simulated day stays on screen
+FAST_FORWARD = 4      # speed-up while fast-forward (F) is on
+
+# --- PROFILING (F3 = timings HUD, F4 = record a trace file) ---
+PROFILER_ENABLED = False  # start with the HUD already on
+PROFILER_WINDOW = 60      # frames averaged for the HUD
+
+# --- GAME HISTORY (history.psh, played back by replay.py) ---
+HISTORY_MAX_MB = 64       # the file stops growing past this; 0 = don't record
+
+# --- TEXT CACHE ---
+TEXT_CACHE_SIZE = 256     # rendered text surfaces kept (least recent dropped)
+
+# --- EPIDEMIC CHART (sidebar) ---
+CHART_HEIGHT = 100    # pixels
+CHART_DAY_PX = 2      # width of one day; older days scroll off the left
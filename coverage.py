@@ -0,0 +1,85 @@
+# ============================================================
+# coverage.py — Precomputed Hospital & Quarantine Influence
+# ============================================================
+#
+# Every tile keeps a count of how many hospitals / quarantine zones
+# cover it. Placing a structure touches only its own 5x5 or 3x3
+# footprint, and the simulation reads a tile's influence in O(1)
+# instead of scanning the hospitals / qzones lists.
+
+import numpy as np
+from config import *
+from rates import DEFAULT_RATES
+
+
+def footprint(r, c, reach, rows, cols):
+    """(r0, r1, c0, c1) bounds of a structure's square, clipped to the map."""
+    return (max(r - reach, 0), min(r + reach + 1, rows),
+            max(c - reach, 0), min(c + reach + 1, cols))
+
+
+def stamp_mask(mask, r, c, reach):
+    """Mark one footprint in a boolean (..., rows, cols) mask."""
+    r0, r1, c0, c1 = footprint(r, c, reach, *mask.shape[-2:])
+    mask[..., r0:r1, c0:c1] = True
+
+
+class CoverageIndex:
+    def __init__(self, rows=GRID_ROWS, cols=GRID_COLS):
+        self.rows = rows
+        self.cols = cols
+
+        # Count layers: how many structures cover each tile
+        self.hospital = [[0] * cols for _ in range(rows)]
+        self.quarantine = [[0] * cols for _ in range(rows)]
+
+        # Tiles that hold a hospital (for the + symbol)
+        self.hospital_tiles = set()
+
+        # Cached NumPy masks, rebuilt only after a placement
+        self._masks = None
+
+    @classmethod
+    def from_structures(cls, rows, cols, hospitals, qzones):
+        index = cls(rows, cols)
+        for (r, c) in hospitals:
+            index.add_hospital(r, c)
+        for (r, c) in qzones:
+            index.add_quarantine(r, c)
+        return index
+
+    # ---------------------------------------------------------
+    # Placement updates
+    # ---------------------------------------------------------
+    def _stamp(self, layer, r, c, reach):
+        r0, r1, c0, c1 = footprint(r, c, reach, self.rows, self.cols)
+        for rr in range(r0, r1):
+            row = layer[rr]
+            for cc in range(c0, c1):
+                row[cc] += 1
+        self._masks = None
+
+    def add_hospital(self, r, c):
+        self.hospital_tiles.add((r, c))
+        self._stamp(self.hospital, r, c, HOSPITAL_REACH)
+
+    def add_quarantine(self, r, c):
+        self._stamp(self.quarantine, r, c, QUARANTINE_REACH)
+
+    # ---------------------------------------------------------
+    # O(1) lookups used by the simulation
+    # ---------------------------------------------------------
+    def recover_boost(self, r, c, rates=DEFAULT_RATES):
+        return rates.hospital_boost if self.hospital[r][c] else 0.0
+
+    def spread_factor(self, r, c, rates=DEFAULT_RATES):
+        return (1 - rates.quarantine_reduction) if self.quarantine[r][c] else 1.0
+
+    def masks(self):
+        """Boolean (hospital, quarantine) arrays for vector_sim."""
+        if self._masks is None:
+            self._masks = (
+                np.array(self.hospital, dtype=bool),
+                np.array(self.quarantine, dtype=bool),
+            )
+        return self._masks
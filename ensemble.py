@@ -0,0 +1,79 @@
+# ============================================================
+# ensemble.py — Batched Replicate Stepping
+# ============================================================
+#
+# Stacks N independent games into one (N, rows, cols) array, each
+# with its own hospital and quarantine layers, and advances all of
+# them with a single vector_sim kernel call per day. Used to evaluate
+# strategies over thousands of replicates without a Python loop per
+# grid.
+
+import numpy as np
+from config import *
+from tools import place_vaccine, place_hospital
+from coverage import stamp_mask
+from sim_rng import SimRandom
+from vector_sim import GRID_DTYPE, step_array
+
+
+COUNTED_STATES = (SUS, INF, REC, DED)
+
+
+class Ensemble:
+    def __init__(self, n, difficulty_mult, rows=GRID_ROWS, cols=GRID_COLS,
+                 rng=None):
+        self.n = n
+        self.difficulty_mult = difficulty_mult
+        self.rng = rng if rng is not None else SimRandom()
+        self.day = 0
+
+        shape = (n, rows, cols)
+        self.grids = np.full(shape, SUS, dtype=GRID_DTYPE)
+        self.hospital = np.zeros(shape, dtype=bool)
+        self.quarantine = np.zeros(shape, dtype=bool)
+
+    # ---------------------------------------------------------
+    # Per-replicate setup and player actions
+    # ---------------------------------------------------------
+    def infect(self, r, c, replicate=slice(None)):
+        self.grids[replicate, r, c] = INF
+
+    def add_hospital(self, i, r, c):
+        # the hospital mask layer stands in for a hospitals list here
+        place_hospital(self.grids[i], [], r, c)
+        stamp_mask(self.hospital[i], r, c, HOSPITAL_REACH)
+
+    def add_quarantine(self, i, r, c):
+        stamp_mask(self.quarantine[i], r, c, QUARANTINE_REACH)
+
+    def vaccinate(self, i, r, c):
+        place_vaccine(self.grids[i], r, c)
+
+    # ---------------------------------------------------------
+    # Stepping
+    # ---------------------------------------------------------
+    def counts(self):
+        """Per-replicate [S, I, R, D] counts, shape (n, 4)."""
+        return np.stack(
+            [(self.grids == s).sum(axis=(1, 2)) for s in COUNTED_STATES],
+            axis=1
+        )
+
+    def step_day(self):
+        self.grids = step_array(
+            self.grids, self.difficulty_mult,
+            self.hospital, self.quarantine, self.rng
+        )
+        self.day += 1
+
+    def step_turn(self, days=10, history=False):
+        """
+        Advance every replicate by `days`. Returns the final (n, 4)
+        counts, or a (days, n, 4) array of daily counts if history.
+        """
+        daily = []
+        for _ in range(days):
+            self.step_day()
+            if history:
+                daily.append(self.counts())
+        return np.stack(daily) if history else self.counts()
@@ -0,0 +1,130 @@
+# ============================================================
+# frontier.py — Active-Frontier (Sparse) Simulation
+# ============================================================
+#
+# Only infected tiles and the susceptible tiles touching them can
+# change on a given day, so this mode keeps the set of infected tiles
+# and evaluates just that frontier. Untouched susceptibles far from
+# the outbreak and settled REC/DED tiles are never visited, so a day
+# costs O(outbreak size) instead of O(map size).
+#
+# Same rules as simulation.simulate_day, so results follow the same
+# distribution as the full scan. The roll order differs (infected
+# tiles roll first, then exposed ones, in set order), so a seeded run
+# does not reproduce the full scan's exact outcome.
+
+from config import *
+from sim_rng import ensure_rng
+from rates import DEFAULT_RATES
+from simulation import default_coverage, run_turn
+
+
+NEIGHBOR_OFFSETS = (
+    (-1, 0), (1, 0), (0, -1), (0, 1),
+    (-1, -1), (-1, 1), (1, -1), (1, 1)
+)
+
+
+class ActiveFrontier:
+    def __init__(self, grid=None):
+        self.infected = set()
+        if grid is not None:
+            for r, row in enumerate(grid):
+                for c, state in enumerate(row):
+                    if state == INF:
+                        self.infected.add((r, c))
+
+    def add(self, r, c):
+        """Register a tile that was infected outside the simulation."""
+        self.infected.add((r, c))
+
+    def __len__(self):
+        return len(self.infected)
+
+
+# -------------------------------------------------------------------
+# One day on the frontier: applies and returns (r, c, new_state) list
+# -------------------------------------------------------------------
+def _advance_day(grid, difficulty_mult, coverage, frontier, tally, rng,
+                 rates=DEFAULT_RATES):
+    rows = len(grid)
+    cols = len(grid[0])
+
+    # Tools (vaccine, hospital) may have cured tiles since yesterday
+    infected = [(r, c) for (r, c) in frontier.infected if grid[r][c] == INF]
+
+    # Infected neighbour count for every exposed susceptible tile
+    exposed = {}
+    for (r, c) in infected:
+        for dr, dc in NEIGHBOR_OFFSETS:
+            nr = r + dr
+            nc = c + dc
+            if 0 <= nr < rows and 0 <= nc < cols and grid[nr][nc] == SUS:
+                exposed[(nr, nc)] = exposed.get((nr, nc), 0) + 1
+
+    # At most two rolls per infected tile and one per exposed tile
+    roll = iter(rng.take(2 * len(infected) + len(exposed))).__next__
+
+    changes = []
+
+    # Recovery / death of infected tiles
+    for (r, c) in infected:
+        recover_rate = rates.recover + coverage.recover_boost(r, c, rates)
+        if roll() < recover_rate:
+            changes.append((r, c, REC))
+        elif roll() < rates.death:
+            changes.append((r, c, DED))
+
+    # Infection spread onto the frontier
+    base_spread = rates.infect * difficulty_mult
+    for (r, c), neighbors in exposed.items():
+        spread_rate = base_spread * coverage.spread_factor(r, c, rates)
+        spread_chance = 1 - (1 - spread_rate)**neighbors
+        if roll() < spread_chance:
+            changes.append((r, c, INF))
+
+    # Apply all transitions at once (same as writing into new_grid)
+    still_infected = set(infected)
+    for (r, c, state) in changes:
+        if tally is not None:
+            tally.move(grid[r][c], state)
+        grid[r][c] = state
+        if state == INF:
+            still_infected.add((r, c))
+        else:
+            still_infected.discard((r, c))
+    frontier.infected = still_infected
+
+    return changes
+
+
+# -------------------------------------------------------------------
+# SPARSE SIMULATION: runs 1 day, updating `grid` in place
+# -------------------------------------------------------------------
+def simulate_day_sparse(grid, difficulty_mult, hospitals, qzones,
+                        coverage=None, frontier=None, tally=None, rng=None,
+                        rates=DEFAULT_RATES):
+    coverage = default_coverage(grid, hospitals, qzones, coverage)
+    if frontier is None:
+        frontier = ActiveFrontier(grid)
+    rng = ensure_rng(rng)
+
+    _advance_day(grid, difficulty_mult, coverage, frontier, tally, rng, rates)
+    return grid
+
+
+# -------------------------------------------------------------------
+# SPARSE TURN: runs `days` days in place (see simulation.simulate_turn)
+# -------------------------------------------------------------------
+def simulate_turn_sparse(grid, difficulty_mult, hospitals, qzones, days=10,
+                         coverage=None, frontier=None, tally=None, rng=None,
+                         history=False, on_day=None, rates=DEFAULT_RATES):
+    coverage = default_coverage(grid, hospitals, qzones, coverage)
+    if frontier is None:
+        frontier = ActiveFrontier(grid)
+
+    def step(rng, tally, report):
+        return _advance_day(grid, difficulty_mult, coverage, frontier,
+                            tally, rng, rates)
+
+    return run_turn(grid, step, days, tally, rng, history, on_day)
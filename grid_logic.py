@@ -1,189 +1,371 @@
 # ============================================================
 # grid_logic.py — Grid Rendering & Disease Simulation Logic
 # ============================================================
+#
+# The rendering half lives here; the simulation itself is in the
+# pygame-free simulation.py and is re-exported below, so the game can
+# keep importing everything from grid_logic.
 
 import pygame
+import numpy as np
 from config import *
-import random
-import math
+from coverage import CoverageIndex
+from camera import Camera
+from stencil import disk_offsets
+from bytegrid import ByteGrid
+from simulation import (make_grid, check_end_conditions, count_infected_neighbors,
+                        hospital_near, in_quarantine, apply_changes,
+                        simulate_day, simulate_turn)
 
 
 # -------------------------------------------------------------------
-# Create initial empty grid (all susceptible)
+# Tile colors per state
 # -------------------------------------------------------------------
-def make_grid():
-    return [[SUS for _ in range(GRID_COLS)] for _ in range(GRID_ROWS)]
+STATE_COLORS = {
+    SUS: COLOR_SUSCEPTIBLE,
+    INF: COLOR_INFECTED,
+    REC: COLOR_RECOVERED,
+    DED: COLOR_DEAD,
+    QUA: COLOR_QUARANTINE,
+}
+UNKNOWN_COLOR = (255, 0, 255)
+
+
+# Palette lookup table: PALETTE[state] -> RGB (unknown states magenta)
+PALETTE = np.empty((256, 3), dtype=np.uint8)
+PALETTE[:] = UNKNOWN_COLOR
+for _state, _color in STATE_COLORS.items():
+    PALETTE[_state] = _color
+
+
+def draw_cell(surface, r, c, state, size=CELL_SIZE):
+    color = STATE_COLORS.get(state, UNKNOWN_COLOR)
+    pygame.draw.rect(surface, color, (c * size, r * size, size, size))
 
 
 # -------------------------------------------------------------------
 # Draw the grid to the screen
 # -------------------------------------------------------------------
-def draw_grid(screen, grid, hospitals=None, quarantines=None):
+def draw_grid(screen, grid, hospitals=None, quarantines=None, coverage=None):
     if hospitals is None:
         hospitals = []
     if quarantines is None:
         quarantines = []
-    for r in range(GRID_ROWS):
-        for c in range(GRID_COLS):
+    rows = len(grid)
+    cols = len(grid[0])
+    if coverage is None:
+        coverage = CoverageIndex.from_structures(
+            rows, cols, hospitals, quarantines
+        )
+
+    # one tint tile shared by every quarantined cell
+    overlay = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
+    overlay.fill((255, 255, 0, 180))
+
+    for r in range(rows):
+        for c in range(cols):
             x = c * CELL_SIZE
             y = r * CELL_SIZE
 
-            state = grid[r][c]
-
-            if state == SUS:
-                color = COLOR_SUSCEPTIBLE
-            elif state == INF:
-                color = COLOR_INFECTED
-            elif state == REC:
-                color = COLOR_RECOVERED
-            elif state == DED:
-                color = COLOR_DEAD
-            elif state == QUA:
-                color = COLOR_QUARANTINE
-            else:
-                color = (255, 0, 255)
-
-            pygame.draw.rect(screen, color, (x, y, CELL_SIZE, CELL_SIZE))
+            draw_cell(screen, r, c, grid[r][c])
 
             # -----------------------------
             # HOSPITAL VISUAL (+ symbol)
             # -----------------------------
-            if (r, c) in hospitals:
+            if (r, c) in coverage.hospital_tiles:
                 cx = x + CELL_SIZE // 2
                 cy = y + CELL_SIZE // 2
                 pygame.draw.line(screen, WHITE, (cx - 6, cy), (cx + 6, cy), 2)
                 pygame.draw.line(screen, WHITE, (cx, cy - 6), (cx, cy + 6), 2)
-            # -----------------------------
-            # HOSPITAL RADIUS OUTLINE
-            # -----------------------------
-            for (hr, hc) in hospitals:
-                if abs(hr - r) <= 2 and abs(hc - c) <= 2:
-                    # Only draw border ONCE per hospital, at the corner tile
-                    if r == hr - 2 and c == hc - 2:
-                        rect_x = (hc - 2) * CELL_SIZE
-                        rect_y = (hr - 2) * CELL_SIZE
-                        rect_w = CELL_SIZE * 5
-                        rect_h = CELL_SIZE * 5
-                        pygame.draw.rect(screen, (255, 255, 255), (rect_x, rect_y, rect_w, rect_h), 2)
-
 
             # -----------------------------
             # QUARANTINE VISUAL (3x3 box)
+            # one subtle yellow pass per zone covering this tile
             # -----------------------------
-            for (qr, qc) in quarantines:
-                if abs(qr - r) <= 1 and abs(qc - c) <= 1:
-                    # subtle yellow overlay
-                    overlay = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
-                    overlay.fill((255, 255, 0, 180))  
-                    screen.blit(overlay, (x, y))
+            for _ in range(coverage.quarantine[r][c]):
+                screen.blit(overlay, (x, y))
 
+    # -----------------------------
+    # HOSPITAL RADIUS OUTLINE (once per hospital)
+    # -----------------------------
+    for (hr, hc) in hospitals:
+        rect_x = (hc - HOSPITAL_REACH) * CELL_SIZE
+        rect_y = (hr - HOSPITAL_REACH) * CELL_SIZE
+        rect_w = CELL_SIZE * (2 * HOSPITAL_REACH + 1)
+        rect_h = CELL_SIZE * (2 * HOSPITAL_REACH + 1)
+        pygame.draw.rect(screen, (255, 255, 255), (rect_x, rect_y, rect_w, rect_h), 2)
 
 
-def check_end_conditions(grid):
-    has_inf = any(INF in row for row in grid)
-    has_susc = any(SUS in row for row in grid)
-
-    if not has_inf:
-        return "VICTORY! Infection eliminated."
+# -------------------------------------------------------------------
+# Zoomed-out views: several tiles share one pixel, and the most
+# important state in the block wins (INF > DED > QUA > REC > SUS)
+# -------------------------------------------------------------------
+_RANK = np.zeros(256, dtype=np.uint8)          # unknown states rank 0
+_UNRANK = np.full(256, 255, dtype=np.uint8)    # rank 0 -> magenta
+for _rank, _state in enumerate((SUS, REC, QUA, DED, INF), start=1):
+    _RANK[_state] = _rank
+    _UNRANK[_rank] = _state
 
-    total_cells = len(grid) * len(grid[0])
-    infected_count = sum(row.count(INF) for row in grid)
 
-    if infected_count == total_cells:
-        return "DEFEAT! Entire map infected."
+def downsample(states, block):
+    """Reduce every block x block square of tiles to one tile."""
+    if block == 1:
+        return states
+    ranks = _RANK[states]
+    h, w = ranks.shape
+    ranks = np.pad(ranks, ((0, -h % block), (0, -w % block)))
+    h, w = ranks.shape
+    ranks = ranks.reshape(h // block, block, w // block, block).max(axis=(1, 3))
+    return _UNRANK[ranks]
 
-    return None
 
 # -------------------------------------------------------------------
-# Count infected neighbors
+# Vectorized paint: palette lookup -> 1 px per tile -> one scale
 # -------------------------------------------------------------------
-def count_infected_neighbors(grid, r, c):
-    neighbors = [
-        (-1, 0), (1, 0), (0, -1), (0, 1),
-        (-1, -1), (-1, 1), (1, -1), (1, 1)
-    ]
-    count = 0
-    for dr, dc in neighbors:
-        nr = r + dr
-        nc = c + dc
-        if 0 <= nr < GRID_ROWS and 0 <= nc < GRID_COLS:
-            if grid[nr][nc] == INF:
-                count += 1
-    return count
+def paint_grid_array(surface, grid, dest=(0, 0), cell_px=CELL_SIZE, block=1,
+                     cache=None):
+    """
+    Paint every tile of `grid` onto `surface` at `dest` in one go, each
+    tile (or block of tiles) cell_px pixels wide. `cache` is an optional
+    dict of scratch surfaces reused between calls.
+    """
+    states = downsample(np.asarray(grid, dtype=np.uint8), block)
+    rows, cols = states.shape
+    if cache is None:
+        cache = {}
+
+    pixels = cache.get(("pixels", cols, rows))
+    if pixels is None:
+        pixels = cache[("pixels", cols, rows)] = pygame.Surface((cols, rows), 0, surface)
+
+    # surfarray is indexed [x, y], so look up through the transposed view
+    pygame.surfarray.blit_array(pixels, PALETTE[states.T])
+    if cell_px == 1:
+        surface.blit(pixels, dest)
+        return
+
+    size = (cols * cell_px, rows * cell_px)
+    scaled = cache.get(("scaled",) + size)
+    if scaled is None:
+        scaled = cache[("scaled",) + size] = pygame.Surface(size, 0, surface)
+    pygame.transform.scale(pixels, size, scaled)
+    surface.blit(scaled, dest)
 
 
 # -------------------------------------------------------------------
-# Hospital detection near a tile
+# Placement preview of a radius action's stencil, cached per zoom
 # -------------------------------------------------------------------
-def hospital_near(hospitals, r, c):
-    for hr, hc in hospitals:
-        if abs(hr - r) <= 2 and abs(hc - c) <= 2:
-            return True
-    return False
+_PREVIEW_CACHE = {}
+
+
+def stencil_preview(radius, px_per_tile, color, cell_size=CELL_SIZE):
+    """
+    Translucent surface covering exactly the tiles the stencil hits,
+    at `px_per_tile` screen pixels per tile. Returns (surface, offset):
+    blit at the target tile's screen corner minus offset.
+    """
+    key = (radius, px_per_tile, color, cell_size)
+    cached = _PREVIEW_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    reach = int(radius // cell_size)
+    size = max(1, int((2 * reach + 1) * px_per_tile))
+    surface = pygame.Surface((size, size), pygame.SRCALPHA)
+
+    # Each stencil row is one contiguous run of tiles
+    rows = {}
+    for dr, dc in disk_offsets(radius, cell_size):
+        lo, hi = rows.get(dr, (dc, dc))
+        rows[dr] = (min(lo, dc), max(hi, dc))
+    for dr, (lo, hi) in rows.items():
+        y0 = int((dr + reach) * px_per_tile)
+        y1 = max(int((dr + reach + 1) * px_per_tile), y0 + 1)
+        x0 = int((lo + reach) * px_per_tile)
+        x1 = max(int((hi + reach + 1) * px_per_tile), x0 + 1)
+        surface.fill(color, (x0, y0, x1 - x0, y1 - y0))
+
+    cached = _PREVIEW_CACHE[key] = (surface, int(reach * px_per_tile))
+    return cached
 
 
 # -------------------------------------------------------------------
-# Quarantine zone detection
+# Cached viewport surface: only repaint tiles that changed
 # -------------------------------------------------------------------
-def in_quarantine(qzones, r, c):
-    for (qr, qc) in qzones:
-        # quarantine = 3x3 area (
-        if abs(qr - r) <= 1 and abs(qc - c) <= 1:
-            return True
-    return False
+class GridRenderer:
+    """
+    Keeps the painted viewport on its own surface and remembers which
+    state every visible tile was painted with. Each frame only the
+    tiles whose state differs are repainted (from a `changed` list of
+    (r, c) / (r, c, state) if the caller has one, otherwise by diffing the visible
+    window), then the surface is blitted. An idle frame costs one blit.
+
+    Moving the camera, zooming out past 1 tile per pixel, or
+    vectorized=True repaint the whole visible window through
+    paint_grid_array instead, which costs the same for 1 or every
+    visible tile changed. Nothing outside the camera is ever touched.
+    """
+
+    def __init__(self, camera=None, vectorized=GRID_RENDERER == "surfarray"):
+        self.camera = camera if camera is not None else Camera()
+        self.vectorized = vectorized
+        self.surface = pygame.Surface((self.camera.view_w, self.camera.view_h))
+        self.cache = {}
+        self.shown = None
+        self.view = None
+        self.overlay = StructureOverlay(self.camera)
+
+    def invalidate(self):
+        self.shown = None
+
+    def _window(self, grid):
+        r0, r1, c0, c1 = self.camera.visible_cells()
+        if hasattr(grid, "shape"):
+            return np.array(grid[r0:r1, c0:c1], dtype=np.uint8)
+        if isinstance(grid, ByteGrid):
+            return grid.array()[r0:r1, c0:c1].copy()
+        return np.array([row[c0:c1] for row in grid[r0:r1]], dtype=np.uint8)
+
+    def _repaint_all(self, window):
+        self.surface.fill(BLACK)
+        paint_grid_array(
+            self.surface, window, (0, 0),
+            self.camera.cell_px, self.camera.block, self.cache
+        )
+
+    def _repaint(self, window, cells):
+        for (wr, wc) in cells:
+            draw_cell(self.surface, wr, wc, window[wr, wc], self.camera.cell_px)
+
+    def _changed_in_window(self, window, changed):
+        """Window cells from a list / array of (r, c) or (r, c, state)."""
+        cells = np.asarray(changed, dtype=np.intp)
+        if cells.size == 0:
+            return []
+        r0, r1, c0, c1 = self.camera.visible_cells()
+        rel = cells[:, :2] - (r0, c0)
+        inside = ((rel >= 0).all(axis=1)
+                  & (rel[:, 0] < r1 - r0) & (rel[:, 1] < c1 - c0))
+        rel = rel[inside]
+        differs = window[rel[:, 0], rel[:, 1]] != self.shown[rel[:, 0], rel[:, 1]]
+        return rel[differs]
+
+    def update(self, grid, changed=None):
+        window = self._window(grid)
+        view = self.camera.state()
+
+        if self.shown is None or view != self.view:
+            self._repaint_all(window)
+        elif self.vectorized or self.camera.block > 1:
+            if not np.array_equal(window, self.shown):
+                self._repaint_all(window)
+        elif changed is not None:
+            # Only the listed tiles are repainted, so only they count as
+            # shown; a tile changed elsewhere (a tool) still diffs later
+            cells = self._changed_in_window(window, changed)
+            self._repaint(window, cells)
+            if len(cells):
+                self.shown[cells[:, 0], cells[:, 1]] = window[cells[:, 0], cells[:, 1]]
+            self.view = view
+            return
+        else:
+            self._repaint(window, np.argwhere(window != self.shown))
+
+        self.shown = window
+        self.view = view
+
+    def draw(self, screen, grid, hospitals=(), quarantines=(), changed=None):
+        self.update(grid, changed)
+        self.overlay.sync(hospitals, quarantines)
+        screen.blit(self.surface, (0, 0))
+        self.overlay.draw(screen)
 
 
 # -------------------------------------------------------------------
-# MAIN SIMULATION: runs 1 day
+# Pre-baked structure overlays
 # -------------------------------------------------------------------
-def simulate_day(grid, difficulty_mult, hospitals, qzones):
-    new_grid = [row[:] for row in grid]
-
-    for r in range(GRID_ROWS):
-        for c in range(GRID_COLS):
-            state = grid[r][c]
-
-            # Dead stays dead
-            if state == DED:
-                continue
-
-            # Quarantine stays a static zone
-            if state == QUA:
-                continue
-
-            # Recovery from INF
-            if state == INF:
-                recover_rate = BASE_RECOVER_RATE
-                death_rate = BASE_DEATH_RATE
-
-                # Hospitals help nearby tiles
-                if hospital_near(hospitals, r, c):
-                    recover_rate += HOSPITAL_BOOST
-
-                if random.random() < recover_rate:
-                    new_grid[r][c] = REC
-                    continue
-
-                # Death check
-                if random.random() < death_rate:
-                    new_grid[r][c] = DED
-                    continue
-
-            # Infection spread (only if susceptible)
-            if state == SUS:
-                neighbors = count_infected_neighbors(grid, r, c)
-                if neighbors > 0:
-
-                    spread_rate = BASE_INFECT_RATE * difficulty_mult
-
-                    # quarantine reduces spread
-                    if in_quarantine(qzones, r, c):
-                        spread_rate *= (1 - QUARANTINE_REDUCTION)
-
-                    # multiple neighbors = more chance
-                    spread_chance = 1 - (1 - spread_rate)**neighbors
-
-                    if random.random() < spread_chance:
-                        new_grid[r][c] = INF
+class StructureOverlay:
+    """
+    Two transparent viewport-sized layers: the yellow quarantine tint
+    and the hospital + symbols / 5x5 outlines. A structure is painted
+    into its layer once, when it first shows up in the hospitals /
+    quarantines list (or when the camera moves), so a frame just blits
+    both layers.
+    """
+
+    def __init__(self, camera):
+        self.camera = camera
+        size = (camera.view_w, camera.view_h)
+        self.quarantine_layer = pygame.Surface(size, pygame.SRCALPHA)
+        self.hospital_layer = pygame.Surface(size, pygame.SRCALPHA)
+        self.clear()
+
+    def clear(self):
+        self.quarantine_layer.fill((0, 0, 0, 0))
+        self.hospital_layer.fill((0, 0, 0, 0))
+        self.tint_count = {}
+        self.n_hospitals = 0
+        self.n_quarantines = 0
+        self.view = self.camera.state()
+
+    def _visible(self, r, c, reach):
+        r0, r1, c0, c1 = self.camera.visible_cells()
+        return r0 - reach <= r < r1 + reach and c0 - reach <= c < c1 + reach
+
+    def add_quarantine(self, r, c):
+        self.n_quarantines += 1
+        if not self._visible(r, c, QUARANTINE_REACH):
+            return
+
+        cam = self.camera
+        tile = max(1, -(-cam.cell_px // cam.block))
+
+        # Overlapping zones stack like repeated 180-alpha blits
+        for rr in range(max(r - QUARANTINE_REACH, 0),
+                        min(r + QUARANTINE_REACH + 1, cam.rows)):
+            for cc in range(max(c - QUARANTINE_REACH, 0),
+                            min(c + QUARANTINE_REACH + 1, cam.cols)):
+                n = self.tint_count.get((rr, cc), 0) + 1
+                self.tint_count[(rr, cc)] = n
+                alpha = round(255 * (1 - (1 - 180 / 255) ** n))
+                x, y = cam.cell_to_screen(rr, cc)
+                self.quarantine_layer.fill((255, 255, 0, alpha), (x, y, tile, tile))
+
+    def add_hospital(self, r, c):
+        self.n_hospitals += 1
+        if not self._visible(r, c, HOSPITAL_REACH):
+            return
+
+        cam = self.camera
+        layer = self.hospital_layer
+        cell = cam.cell_size
+        arm = max(1, round(6 * cell / CELL_SIZE))
+        width = max(1, round(2 * cell / CELL_SIZE))
+
+        x, y = cam.cell_to_screen(r, c)
+        cx = x + int(cell // 2)
+        cy = y + int(cell // 2)
+        pygame.draw.line(layer, WHITE, (cx - arm, cy), (cx + arm, cy), width)
+        pygame.draw.line(layer, WHITE, (cx, cy - arm), (cx, cy + arm), width)
+
+        ox, oy = cam.cell_to_screen(r - HOSPITAL_REACH, c - HOSPITAL_REACH)
+        size = max(1, round(cell * (2 * HOSPITAL_REACH + 1)))
+        pygame.draw.rect(layer, WHITE, (ox, oy, size, size), width)
+
+    def sync(self, hospitals, quarantines):
+        """Bake any structures appended (or all, after a camera move)."""
+        if (self.camera.state() != self.view
+                or len(hospitals) < self.n_hospitals
+                or len(quarantines) < self.n_quarantines):
+            self.clear()
+        for (r, c) in hospitals[self.n_hospitals:]:
+            self.add_hospital(r, c)
+        for (r, c) in quarantines[self.n_quarantines:]:
+            self.add_quarantine(r, c)
+
+    def draw(self, screen):
+        if self.n_quarantines:
+            screen.blit(self.quarantine_layer, (0, 0))
+        if self.n_hospitals:
+            screen.blit(self.hospital_layer, (0, 0))
 
-    return new_grid
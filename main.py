@@ -2,70 +2,89 @@
 # main.py — Pandemic Strategy Game (Main Engine)
 # ============================================================
 
-import pygame, sys, time
+import pygame
 from config import *
-from grid_logic import make_grid, draw_grid, simulate_day
+from grid_logic import make_grid, simulate_turn, GridRenderer, stencil_preview
+from vector_sim import make_grid_array, simulate_turn_array
 from tools import place_vaccine, place_quarantine, place_hospital
+from coverage import CoverageIndex
+from population import PopulationTally
+from frontier import ActiveFrontier, simulate_turn_sparse
+from sim_rng import SimRandom
+from functools import partial
 from turn_menu import create_turn_buttons
-from ui import draw_start_screen, draw_settings_screen, draw_stats, draw_turn_popup
+from ui import (draw_start_screen, draw_settings_screen, draw_stats,
+                draw_turn_popup, popup_backdrop, EpidemicChart)
+from scene import run_scene
+from animation import TurnProducer, animate_turn
+from profiler import PROFILER
+from savegame import (save_game, load_game, HistoryWriter, open_history,
+                      history_counts)
+from timeseries import TimeSeries
+from camera import Camera
+from bytegrid import ByteGrid
+from sounds import SOUNDS
 import os
 
-pygame.mixer.init()
 
+HIGH_SCORE_FILE = "highscore.txt"   # one "map=days" line per map size
+SAVE_FILE = "savegame.psg"        # autosaved every turn, removed at game end
+HISTORY_FILE = "history.psh"      # every day of the last game (replay.py)
+SERIES_FILE = "series.csv"        # S/I/R/D/Q counts per day of the last game
 
-# =============================
-# LOAD SOUND EFFECTS
-# =============================
-
-SFX_VACCINE = pygame.mixer.Sound("sounds/vaccine.wav")
-SFX_QUARANTINE = pygame.mixer.Sound("sounds/quarantine.wav")
-SFX_HOSPITAL = pygame.mixer.Sound("sounds/hospital.wav")
-SFX_CLICK = pygame.mixer.Sound("sounds/click.wav")
-SFX_VICTORY = pygame.mixer.Sound("sounds/victory.wav")
-SFX_DEFEAT = pygame.mixer.Sound("sounds/defeat.wav")
-
-# =============================
-# LOAD BACKGROUND MUSIC
-# =============================
-pygame.mixer.music.load("sounds/soundtrack.mp3")
-pygame.mixer.music.set_volume(0.4)
-
-
-HIGH_SCORE_FILE = "highscore.txt"
-
-def load_high_score():
+def load_high_scores():
+    """
+    {map name: fewest days to win}. A bare number is a file from before
+    map sizes existed, so it belongs to the Small map.
+    """
+    scores = {}
     if os.path.exists(HIGH_SCORE_FILE):
         with open(HIGH_SCORE_FILE, "r") as f:
-            return int(f.read().strip())
-    return None
-
-def save_high_score(score):
+            for line in f:
+                name, sep, days = line.strip().rpartition("=")
+                if days:
+                    scores[name if sep else "Small"] = int(days)
+    return scores
+
+def load_high_score(map_name):
+    return load_high_scores().get(map_name)
+
+def save_high_score(map_name, score):
+    scores = load_high_scores()
+    scores[map_name] = score
     with open(HIGH_SCORE_FILE, "w") as f:
-        f.write(str(score))
+        for name, days in scores.items():
+            f.write(f"{name}={days}\n")
 
 
-# ------------------------------------------------------------
-# Smooth animated grid transition for 10-day simulation
-# ------------------------------------------------------------
-def animate_simulation(screen, old_grid, new_grid, hospitals, quarantines):
-    steps = 8
-    for i in range(steps):
-        # Linear reveal animation
-        blend = [
-            [new_grid[r][c] if i == steps-1 else old_grid[r][c]
-             for c in range(GRID_COLS)]
-            for r in range(GRID_ROWS)
-        ]
-
-        draw_grid(screen, blend, hospitals, quarantines)
-        pygame.display.flip()
-        pygame.time.delay(40)
+def discard_save():
+    if os.path.exists(SAVE_FILE):
+        os.remove(SAVE_FILE)
+
+
+def load_series(resume, tally, day, history):
+    """
+    A new game's series starts from today's counts; a resumed one is
+    rebuilt from the history file when that covers the whole game.
+    """
+    if resume is not None and history is not None:
+        try:
+            frames = open_history(HISTORY_FILE)
+        except (OSError, ValueError):
+            frames = None
+        if frames is not None and len(frames) == day + 1:
+            return TimeSeries.from_counts(history_counts(frames))
+
+    series = TimeSeries(first_day=day)
+    series.append(tally.counts)
+    return series
 
 
 # ------------------------------------------------------------
 # MAIN GAME LOOP
 # ------------------------------------------------------------
-def game_loop(screen, difficulty, speed):
+def game_loop(screen, difficulty, speed, engine=SIM_ENGINE, map_name="Small",
+              seed=None, resume=None):
 
     # DIFFICULTY MULTIPLIER
     diff_mult = DIFFICULTY_LEVELS[difficulty]
@@ -78,24 +97,86 @@ def game_loop(screen, difficulty, speed):
     else:
         turn_delay = 1.0
 
-    # CREATE INITIAL GRID
-    grid = make_grid()
+    # MAP SIZE (big maps are too slow for the per-cell python engine)
+    rows, cols = MAP_SIZES[map_name]
+    if engine == "python" and rows * cols > PYTHON_ENGINE_MAX_CELLS:
+        engine = "numpy"
+
+    # One seeded random stream per game (same seed = same outbreak)
+    rng = SimRandom(seed)
+
     hospitals = []
     quarantines = []
+    if resume is not None:
+        rng = resume["rng"] or rng
+        hospitals = resume["hospitals"]
+        quarantines = resume["quarantines"]
+    coverage = CoverageIndex.from_structures(rows, cols, hospitals, quarantines)
+    tally = PopulationTally(rows, cols)
+
+    # CREATE INITIAL GRID (list-of-lists or NumPy array per engine)
+    # and the matching whole-turn kernel
+    frontier = ActiveFrontier()
+    if engine == "numpy":
+        turn = partial(simulate_turn_array, coverage=coverage, rng=rng)
+        grid = make_grid_array(rows, cols)
+    elif engine == "sparse":
+        turn = partial(simulate_turn_sparse, coverage=coverage,
+                       frontier=frontier, rng=rng)
+        grid = make_grid(rows, cols)
+    else:
+        turn = partial(simulate_turn, coverage=coverage, rng=rng)
+        grid = make_grid(rows, cols)
+
+    # RESUMED GAME: saved grid in this engine's format
+    if resume is not None:
+        grid = resume["grid"] if engine == "numpy" else ByteGrid.from_array(resume["grid"])
+        frontier.infected = ActiveFrontier(grid).infected
+        tally = PopulationTally.from_array(resume["grid"])
+
+    # Camera over the map (wheel = zoom, arrows/WASD/right-drag = pan)
+    camera = Camera(rows, cols)
+    renderer = GridRenderer(camera)
+    chart = EpidemicChart()
     day = 0
     energy = STARTING_ENERGY
 
+    # Board and sidebar drawing, timed for the F3 HUD / F4 trace
+    def draw_board():
+        with PROFILER.span("draw_grid"):
+            renderer.draw(screen, grid, hospitals, quarantines)
+
+    def draw_sidebar(counts=None, shown_day=None):
+        counts = tally.counts if counts is None else counts
+        shown_day = day if shown_day is None else shown_day
+        with PROFILER.span("draw_stats"):
+            chart.update(series, shown_day - series.first_day + 1)
+            draw_stats(
+                screen,
+                infected=counts[INF],
+                recovered=counts[REC],
+                dead=counts[DED],
+                energy=energy,
+                day=shown_day,
+                chart=chart
+            )
+
     # NEW FLAG
     first_turn = True
 
+    if resume is not None:
+        day = resume["day"]
+        energy = resume["energy"]
+        first_turn = False
+
     # -------------------------------------------
     # STARTING INFECTION SELECTION WITH PROMPT
+    # (skipped when resuming a saved game)
     # -------------------------------------------
-    picking = True
     font = pygame.font.SysFont("arial", 32)
 
-    while picking:
-        draw_grid(screen, grid, hospitals, quarantines)
+    def render_pick():
+        draw_board()
 
         msg = font.render(
             "Click a cell to choose the infection starting point",
@@ -103,19 +184,37 @@ def game_loop(screen, difficulty, speed):
         )
         screen.blit(msg, (40, 20))
 
-        pygame.display.flip()
-
-        for e in pygame.event.get():
-            if e.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-
-            if e.type == pygame.MOUSEBUTTONDOWN:
-                mx, my = e.pos
-                if mx < GRID_COLS * CELL_SIZE:
-                    r = my // CELL_SIZE
-                    c = mx // CELL_SIZE
-                    grid[r][c] = INF
-                    picking = False
+    def handle_pick(e):
+        if camera.handle_event(e):
+            return None
+        if e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
+            return camera.cell_at(*e.pos)
+
+    if resume is None:
+        r, c = run_scene(render_pick, handle_pick, camera.state)
+        grid[r][c] = INF
+        frontier.add(r, c)
+        tally.move(SUS, INF)
+
+        # This game's history replaces the file an older autosave would
+        # resume against, so that save cannot be resumed any more
+        discard_save()
+
+    # Every simulated day is appended here for replay.py, up to the cap
+    history = None
+    if HISTORY_MAX_MB > 0:
+        history = HistoryWriter(HISTORY_FILE, grid, resume=resume is not None,
+                                keep=day + 1, max_bytes=HISTORY_MAX_MB << 20)
+
+    # Epidemic curve: the resumed game's days come back from the history
+    series = load_series(resume, tally, day, history)
+    series.stream_csv(SERIES_FILE)
+
+    def finish_game():
+        if history is not None:
+            history.close()
+        series.close()
+        discard_save()
 
     # -------------------------------------------
     # MAIN TURN-BY-TURN LOOP
@@ -128,149 +227,158 @@ def game_loop(screen, difficulty, speed):
         # -------------------------------
         action_mode = None
 
-        if not first_turn:   
-            buttons = create_turn_buttons()
-            choosing = True
+        if not first_turn:
+            # Autosave between turns (Resume Game on the start screen)
+            if history is not None:
+                history.flush()
+            series.flush()
+            save_game(
+                SAVE_FILE, grid, hospitals, quarantines, day, energy, rng,
+                difficulty=difficulty, speed=speed, map=map_name, engine=engine
+            )
 
-            while choosing:
+            buttons = create_turn_buttons()
 
+            def choice_state():
                 # Hover update
                 mpos = pygame.mouse.get_pos()
                 for b in buttons.values():
                     b.update_hover(mpos)
+                return tuple(b.hovered for b in buttons.values()), energy
+
+            # The board can't change under the modal: draw it once
+            draw_board()
+            draw_sidebar()
+            backdrop = popup_backdrop(screen, energy)
 
-                draw_grid(screen, grid, hospitals, quarantines)
-                draw_stats(
-                    screen,
-                    infected=sum(cell == INF for row in grid for cell in row),
-                    recovered=sum(cell == REC for row in grid for cell in row),
-                    dead=sum(cell == DED for row in grid for cell in row),
-                    energy=energy,
-                    day=day
-                )
-                draw_turn_popup(screen, buttons, energy)
-                pygame.display.flip()
-
-                for e in pygame.event.get():
-                    if e.type == pygame.QUIT:
-                        pygame.quit(); sys.exit()
-                    if e.type == pygame.MOUSEBUTTONDOWN:
-
-                        if buttons["vaccine"].clicked(e.pos) and energy >= COST_VACCINE:
-                            action_mode = "vaccine"
-                            choosing = False
-
-                        if buttons["quarantine"].clicked(e.pos) and energy >= COST_QUARANTINE:
-                            action_mode = "quarantine"
-                            choosing = False
-
-                        if buttons["hospital"].clicked(e.pos) and energy >= COST_HOSPITAL:
-                            action_mode = "hospital"
-                            choosing = False
-
-                        if buttons["endturn"].clicked(e.pos):
-                            action_mode = None
-                            choosing = False
+            def render_choice():
+                draw_turn_popup(screen, buttons, energy, backdrop)
+
+            def handle_choice(e):
+                if e.type == pygame.MOUSEBUTTONDOWN:
+
+                    if buttons["vaccine"].clicked(e.pos) and energy >= COST_VACCINE:
+                        return "vaccine"
+
+                    if buttons["quarantine"].clicked(e.pos) and energy >= COST_QUARANTINE:
+                        return "quarantine"
+
+                    if buttons["hospital"].clicked(e.pos) and energy >= COST_HOSPITAL:
+                        return "hospital"
+
+                    if buttons["endturn"].clicked(e.pos):
+                        return "endturn"
+
+            action_mode = run_scene(render_choice, handle_choice, choice_state)
+            if action_mode == "endturn":
+                action_mode = None
 
         # ----------------------------------------
         # PLAYER PLACES THE CHOSEN ACTION
         # (Only happens after turn 1)
         # ----------------------------------------
         if action_mode:
-            placed = False
 
-            while not placed:
+            def hovered_cell():
+                return camera.cell_at(*pygame.mouse.get_pos())
 
-                draw_grid(screen, grid, hospitals, quarantines)
+            def placement_state():
+                return hovered_cell(), camera.state()
 
-                mx, my = pygame.mouse.get_pos()
-                r = my // CELL_SIZE
-                c = mx // CELL_SIZE
+            def render_placement():
+                draw_board()
 
-                if mx < GRID_COLS * CELL_SIZE:
+                cell = hovered_cell()
+                if cell is not None:
+                    x, y = camera.cell_to_screen(*cell)
+
+                    # preview sizes follow the camera zoom
+                    s = camera.cell_size
+                    k = s / CELL_SIZE
 
                     if action_mode == "vaccine":
-                        pygame.draw.circle(
-                            screen, (0, 150, 255),
-                            (c * CELL_SIZE, r * CELL_SIZE),
-                            VACCINE_RADIUS, 3
+                        # exactly the tiles the vaccine stencil will hit
+                        preview, offset = stencil_preview(
+                            VACCINE_RADIUS, s, (0, 150, 255, 110)
                         )
+                        screen.blit(preview, (x - offset, y - offset))
 
                     elif action_mode == "quarantine":
                         pygame.draw.rect(
                             screen, (255, 255, 0),
-                            (c * CELL_SIZE - 20, r * CELL_SIZE - 20, 60, 60),
+                            (x - 20 * k, y - 20 * k, max(2, 60 * k), max(2, 60 * k)),
                             3
                         )
 
                     elif action_mode == "hospital":
                         pygame.draw.line(
                             screen, WHITE,
-                            (c * CELL_SIZE - 10, r * CELL_SIZE),
-                            (c * CELL_SIZE + 10, r * CELL_SIZE), 3
+                            (x - 10 * k, y),
+                            (x + 10 * k, y), 3
                         )
                         pygame.draw.line(
                             screen, WHITE,
-                            (c * CELL_SIZE, r * CELL_SIZE - 10),
-                            (c * CELL_SIZE, r * CELL_SIZE + 10), 3
+                            (x, y - 10 * k),
+                            (x, y + 10 * k), 3
                         )
                         # draw hospital radius preview (5x5 area)
                         pygame.draw.rect(
                             screen, WHITE,
-                            (c * CELL_SIZE - 2 * CELL_SIZE,
-                             r * CELL_SIZE - 2 * CELL_SIZE,
-                             CELL_SIZE * 5,
-                             CELL_SIZE * 5),
+                            (x - 2 * s,
+                             y - 2 * s,
+                             max(2, s * 5),
+                             max(2, s * 5)),
                             2
                         )
 
-                draw_stats(
-                    screen,
-                    infected=sum(cell == INF for row in grid for cell in row),
-                    recovered=sum(cell == REC for row in grid for cell in row),
-                    dead=sum(cell == DED for row in grid for cell in row),
-                    energy=energy,
-                    day=day
-                )
-                pygame.display.flip()
-
-                for e in pygame.event.get():
-                    if e.type == pygame.QUIT:
-                        pygame.quit(); sys.exit()
-                    if e.type == pygame.MOUSEBUTTONDOWN:
-
-                        mx, my = e.pos
-                        if mx < GRID_COLS * CELL_SIZE:
-                            rr = my // CELL_SIZE
-                            cc = mx // CELL_SIZE
-
-                            if action_mode == "vaccine":
-                                grid = place_vaccine(grid, rr, cc)
-                                energy -= COST_VACCINE
-                                SFX_VACCINE.play()
-
-                            elif action_mode == "quarantine":
-                                place_quarantine(quarantines, rr, cc)
-                                energy -= COST_QUARANTINE
-                                SFX_QUARANTINE.play()
-
-                            elif action_mode == "hospital":
-                                place_hospital(grid, hospitals, rr, cc)
-                                energy -= COST_HOSPITAL
-                                SFX_HOSPITAL.play()
-
-                            placed = True
-                            action_mode = None
+                draw_sidebar()
+
+            def handle_placement(e):
+                if camera.handle_event(e):
+                    return None
+                if e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
+                    return camera.cell_at(*e.pos)
+
+            rr, cc = run_scene(render_placement, handle_placement, placement_state)
+
+            with PROFILER.span("tool"):
+                if action_mode == "vaccine":
+                    grid = place_vaccine(grid, rr, cc, tally)
+                    energy -= COST_VACCINE
+                    SOUNDS.play("vaccine")
+
+                elif action_mode == "quarantine":
+                    place_quarantine(quarantines, rr, cc, coverage)
+                    energy -= COST_QUARANTINE
+                    SOUNDS.play("quarantine")
+
+                elif action_mode == "hospital":
+                    place_hospital(grid, hospitals, rr, cc, coverage, tally)
+                    energy -= COST_HOSPITAL
+                    SOUNDS.play("hospital")
+
+            action_mode = None
 
         # -----------------------------------------------------
         # END TURN → SIMULATE TEN DAYS
         # -----------------------------------------------------
-        for _ in range(10):
-            old = [row[:] for row in grid]
-            new = simulate_day(grid, diff_mult, hospitals, quarantines)
-            animate_simulation(screen, old, new, hospitals, quarantines) 
-            grid = new
-            day += 1
+        # All ten days run as one kernel call in a worker thread while
+        # the animator replays them (SPACE skips, F fast-forwards)
+        if history is not None:
+            history.sync(grid)
+        producer = TurnProducer(
+            turn, grid, (diff_mult, hospitals, quarantines),
+            days=10, tally=tally, history=history, series=series
+        ).start()
+
+        def draw_day_stats(counts, days_done):
+            draw_sidebar(counts, day + days_done)
+
+        grid = animate_turn(
+            screen, renderer, producer, hospitals, quarantines, draw_day_stats,
+            camera=camera
+        )
+        day += 10
 
         # After simulating FIRST 10 days → allow actions
         if first_turn:
@@ -279,30 +387,29 @@ def game_loop(screen, difficulty, speed):
         # -----------------------------------------------------
         # END CONDITIONS
         # -----------------------------------------------------
-        total_cells = GRID_ROWS * GRID_COLS
-        infected_count = sum(cell == INF for row in grid for cell in row)
-        susceptible_count = sum(cell == SUS for row in grid for cell in row)
-
-        if infected_count == 0:
-            pygame.mixer.music.pause()
-            SFX_VICTORY.play()
+        if tally.infected == 0:
+            SOUNDS.pause_music()
+            SOUNDS.play("victory")
             # WIN!
-            high = load_high_score()
+            # High scores are kept per map size
+            high = load_high_score(map_name)
 
             # If no high score yet OR new score is better
             if high is None or day < high:
-                save_high_score(day)
-                msg = f"NEW HIGH SCORE! Won in {day} days."
+                save_high_score(map_name, day)
+                msg = f"NEW HIGH SCORE! Won in {day} days on {map_name}."
             else:
-                msg = f"Victory! Won in {day} days. High Score: {high}"
+                msg = f"Victory! Won in {day} days. {map_name} High Score: {high}"
 
+            finish_game()
             end_screen(screen, msg)
             return
 
 
-        if susceptible_count == 0:
-            pygame.mixer.music.pause()
-            SFX_DEFEAT.play()
+        if tally.susceptible == 0:
+            SOUNDS.pause_music()
+            SOUNDS.play("defeat")
+            finish_game()
             end_screen(screen, "DEFEAT! Entire population infected.")
             return
 
@@ -310,15 +417,8 @@ def game_loop(screen, difficulty, speed):
         energy = min(MAX_ENERGY, energy + ENERGY_REGEN)
 
         # Refresh frame
-        draw_grid(screen, grid, hospitals, quarantines)
-        draw_stats(
-            screen,
-            infected=infected_count,
-            recovered=sum(cell == REC for row in grid for cell in row),
-            dead=sum(cell == DED for row in grid for cell in row),
-            energy=energy,
-            day=day
-        )
+        draw_board()
+        draw_sidebar()
         pygame.display.flip()
 
 
@@ -331,7 +431,7 @@ def end_screen(screen, message):
     font_big = pygame.font.SysFont("arial", 48)
     font_small = pygame.font.SysFont("arial", 28)
 
-    while True:
+    def render():
         screen.fill((0, 0, 0))
 
         # multi-line message support
@@ -346,19 +446,15 @@ def end_screen(screen, message):
         sub = font_small.render("Press ENTER to return to main menu", True, (200, 200, 200))
         screen.blit(sub, (80, SCREEN_HEIGHT//2 + 80))
 
-        pygame.display.flip()
-
-        # --------------------------
-        # CRITICAL: EVENT LOOP
-        # --------------------------
-        for e in pygame.event.get():
-            if e.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+    # --------------------------
+    # CRITICAL: EVENT LOOP
+    # --------------------------
+    def handle(e):
+        if e.type == pygame.KEYDOWN:
+            if e.key == pygame.K_RETURN:
+                return True
 
-            if e.type == pygame.KEYDOWN:
-                if e.key == pygame.K_RETURN:
-                    return
+    run_scene(render, handle)
 
 
 
@@ -367,17 +463,28 @@ def end_screen(screen, message):
 # ------------------------------------------------------------
 def main():
     pygame.init()
-    pygame.mixer.music.play(-1)  
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Pandemic Strategy Game")
 
+    # Effects decode in the background while the start screen is up
+    SOUNDS.preload()
+    SOUNDS.play_music()
+
     while True:   # <-- MAIN LOOP
 
-        draw_start_screen(screen)
-        difficulty, speed = draw_settings_screen(screen)
+        choice = draw_start_screen(screen, can_resume=os.path.exists(SAVE_FILE))
+
+        if choice == "resume":
+            saved = load_game(SAVE_FILE)
+            game_loop(screen, saved["difficulty"], saved["speed"],
+                      engine=saved["engine"], map_name=saved["map"],
+                      resume=saved)
+            continue
+
+        difficulty, speed, map_name = draw_settings_screen(screen)
 
         # This runs the game
-        game_loop(screen, difficulty, speed)
+        game_loop(screen, difficulty, speed, map_name=map_name)
 
         # When game_loop returns (end of game), show start screen again
         # loop continues automatically
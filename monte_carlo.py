@@ -0,0 +1,413 @@
+# ============================================================
+# monte_carlo.py — Headless Monte Carlo Strategy Runner
+# ============================================================
+#
+# Plays many complete games without a window or audio device, using
+# the same make_grid / simulate_turn / tools functions as the real game.
+# Nothing it imports pulls in pygame, so workers start in milliseconds.
+# Each strategy is a plain callable that looks at the game and returns
+# an action for the turn. Replicates are spread across every core with
+# a process pool, and results are summarised per (strategy, difficulty).
+#
+#   python monte_carlo.py --games 500 --strategies vaccine,hospital
+
+import os
+import argparse
+import json
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from config import *
+from simulation import make_grid, simulate_turn
+from tools import place_vaccine, place_quarantine, place_hospital
+from coverage import CoverageIndex
+from population import PopulationTally
+from frontier import ActiveFrontier, simulate_turn_sparse
+from vector_sim import make_grid_array, simulate_turn_array
+from sim_rng import SimRandom
+from savegame import HistoryWriter
+from timeseries import TimeSeries
+from rates import DEFAULT_RATES
+
+
+DAYS_PER_TURN = 10
+MAX_DAYS = 2000     # safety cap so a stalemate cannot run forever
+
+ACTION_COSTS = {
+    "vaccine": COST_VACCINE,
+    "quarantine": COST_QUARANTINE,
+    "hospital": COST_HOSPITAL,
+}
+
+
+# ============================================================
+# HEADLESS GAME (mirrors main.game_loop without pygame)
+# ============================================================
+class HeadlessGame:
+    def __init__(self, difficulty, engine="sparse", start=None, rng=None,
+                 rows=GRID_ROWS, cols=GRID_COLS, sim_rng=None, history=None,
+                 series=None, rates=DEFAULT_RATES):
+        self.rng = rng or random.Random()
+        self.history = history
+        self.series = series
+        self.sim_rng = sim_rng or SimRandom()
+
+        # A difficulty name, or a raw multiplier (parameter sweeps)
+        if difficulty in DIFFICULTY_LEVELS:
+            self.diff_mult = DIFFICULTY_LEVELS[difficulty]
+        else:
+            self.diff_mult = float(difficulty)
+        self.hospitals = []
+        self.quarantines = []
+        self.rows = rows
+        self.cols = cols
+        self.coverage = CoverageIndex(rows, cols)
+        self.frontier = ActiveFrontier()
+        self.tally = PopulationTally(rows, cols)
+        self.day = 0
+        self.energy = STARTING_ENERGY
+
+        if engine == "numpy":
+            self.grid = make_grid_array(rows, cols)
+            self.turn = partial(simulate_turn_array, rates=rates)
+        elif engine == "sparse":
+            self.grid = make_grid(rows, cols)
+            self.turn = partial(simulate_turn_sparse, frontier=self.frontier,
+                                rates=rates)
+        else:
+            self.grid = make_grid(rows, cols)
+            self.turn = partial(simulate_turn, rates=rates)
+
+        # Starting infection (the player's first click)
+        if start is None:
+            start = (self.rng.randrange(rows), self.rng.randrange(cols))
+        r, c = start
+        self.grid[r][c] = INF
+        self.frontier.add(r, c)
+        self.tally.move(SUS, INF)
+
+    # ---------------------------------------------------------
+    # Queries for strategies
+    # ---------------------------------------------------------
+    def count(self, state):
+        return self.tally.counts[state]
+
+    def infected_cells(self):
+        return [
+            (r, c)
+            for r in range(self.rows)
+            for c in range(self.cols)
+            if self.grid[r][c] == INF
+        ]
+
+    def can_afford(self, action):
+        return self.energy >= ACTION_COSTS[action]
+
+    # ---------------------------------------------------------
+    # Player action + simulation
+    # ---------------------------------------------------------
+    def apply(self, action, r, c):
+        if action is None or not self.can_afford(action):
+            return False
+
+        if action == "vaccine":
+            self.grid = place_vaccine(self.grid, r, c, self.tally)
+        elif action == "quarantine":
+            place_quarantine(self.quarantines, r, c, self.coverage)
+        elif action == "hospital":
+            place_hospital(self.grid, self.hospitals, r, c, self.coverage,
+                           self.tally)
+
+        self.energy -= ACTION_COSTS[action]
+        return True
+
+    def _on_day(self, counts, changes):
+        if self.history is not None:
+            self.history.append_changes(changes)
+        if self.series is not None:
+            self.series.append(counts)
+
+    def advance_turn(self):
+        on_day = None
+        if self.history is not None or self.series is not None:
+            on_day = self._on_day
+        if self.history is not None:
+            self.history.sync(self.grid)
+
+        self.turn(
+            self.grid, self.diff_mult, self.hospitals, self.quarantines,
+            days=DAYS_PER_TURN, coverage=self.coverage, tally=self.tally,
+            rng=self.sim_rng, on_day=on_day
+        )
+        self.day += DAYS_PER_TURN
+
+
+# ============================================================
+# STRATEGIES
+# Each takes (game, rng) and returns (action, r, c) or None.
+# ============================================================
+def _random_infected(game, rng):
+    cells = game.infected_cells()
+    return rng.choice(cells) if cells else None
+
+
+def do_nothing(game, rng):
+    return None
+
+
+def random_action(game, rng):
+    choices = [a for a in ACTION_COSTS if game.can_afford(a)]
+    target = _random_infected(game, rng)
+    if not choices or target is None:
+        return None
+    return (rng.choice(choices),) + target
+
+
+def vaccine_hotspot(game, rng):
+    target = _random_infected(game, rng)
+    if target is None or not game.can_afford("vaccine"):
+        return None
+    return ("vaccine",) + target
+
+
+def hospital_hotspot(game, rng):
+    target = _random_infected(game, rng)
+    if target is None or not game.can_afford("hospital"):
+        return None
+    return ("hospital",) + target
+
+
+def quarantine_frontier(game, rng):
+    target = _random_infected(game, rng)
+    if target is None or not game.can_afford("quarantine"):
+        return None
+    return ("quarantine",) + target
+
+
+def greedy(game, rng):
+    """Spend on the most expensive action that is affordable."""
+    target = _random_infected(game, rng)
+    if target is None:
+        return None
+    for action in sorted(ACTION_COSTS, key=ACTION_COSTS.get, reverse=True):
+        if game.can_afford(action):
+            return (action,) + target
+    return None
+
+
+STRATEGIES = {
+    "nothing": do_nothing,
+    "random": random_action,
+    "vaccine": vaccine_hotspot,
+    "hospital": hospital_hotspot,
+    "quarantine": quarantine_frontier,
+    "greedy": greedy,
+}
+
+
+# ============================================================
+# ONE GAME
+# ============================================================
+def play_game(strategy, difficulty, seed, engine="sparse", map_name="Small",
+              trace_dir=None, series_dir=None, rates=DEFAULT_RATES,
+              track_peak=False):
+    """
+    One complete game. `rates` overrides the disease rates. With
+    track_peak (or a series_dir) the result also has the day and size
+    of the infection peak.
+    """
+    if isinstance(strategy, str):
+        name, strategy = strategy, STRATEGIES[strategy]
+    else:
+        name = getattr(strategy, "__name__", repr(strategy))
+
+    # Strategy choices and simulation rolls come from separate streams,
+    # both derived from the game's seed
+    rng = random.Random(seed)
+    sim_rng = SimRandom(seed)
+
+    rows, cols = MAP_SIZES[map_name]
+    game = HeadlessGame(difficulty, engine=engine, rng=rng, rows=rows, cols=cols,
+                        sim_rng=sim_rng, rates=rates)
+
+    # Optional per-day trace, viewable with replay.py
+    if trace_dir is not None:
+        path = os.path.join(trace_dir, f"{name}_{difficulty}_{seed}.psh")
+        game.history = HistoryWriter(path, game.grid)
+
+    # Optional per-day S/I/R/D/Q counts, streamed to CSV as the game runs
+    if series_dir is not None or track_peak:
+        game.series = TimeSeries()
+        game.series.append(game.tally.counts)
+    if series_dir is not None:
+        game.series.stream_csv(
+            os.path.join(series_dir, f"{name}_{difficulty}_{seed}.csv"))
+
+    first_turn = True
+    result = None
+
+    while game.day < MAX_DAYS:
+        if not first_turn:
+            choice = strategy(game, rng)
+            if choice is not None:
+                game.apply(*choice)
+
+        game.advance_turn()
+        first_turn = False
+
+        # Same end conditions as main.game_loop
+        if game.count(INF) == 0:
+            result = "victory"
+            break
+        if game.count(SUS) == 0:
+            result = "defeat"
+            break
+
+        game.energy = min(MAX_ENERGY, game.energy + ENERGY_REGEN)
+
+    if game.history is not None:
+        game.history.close()
+    peak = None
+    if game.series is not None:
+        peak = game.series.peak(INF)
+        game.series.close()
+
+    result = {
+        "strategy": name,
+        "difficulty": difficulty,
+        "seed": seed,
+        "map": map_name,
+        "result": result or "timeout",
+        "days": game.day,
+        "dead": game.count(DED),
+        "recovered": game.count(REC),
+        "susceptible": game.count(SUS),
+    }
+    if peak is not None:
+        result["peak_day"], result["peak_infected"] = peak
+    return result
+
+
+def _play_task(task):
+    return play_game(*task)
+
+
+# ============================================================
+# BATCH RUN + SUMMARY
+# ============================================================
+def _distribution(values):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return {
+        "mean": statistics.fmean(ordered),
+        "median": statistics.median(ordered),
+        "stdev": statistics.pstdev(ordered),
+        "p10": ordered[int(0.1 * (len(ordered) - 1))],
+        "p90": ordered[int(0.9 * (len(ordered) - 1))],
+        "min": ordered[0],
+        "max": ordered[-1],
+    }
+
+
+def summarize(results):
+    groups = {}
+    for res in results:
+        groups.setdefault((res["strategy"], res["difficulty"]), []).append(res)
+
+    summary = []
+    for (name, difficulty), games in groups.items():
+        wins = [g for g in games if g["result"] == "victory"]
+        summary.append({
+            "strategy": name,
+            "difficulty": difficulty,
+            "games": len(games),
+            "win_rate": len(wins) / len(games),
+            "days_to_victory": _distribution([g["days"] for g in wins]),
+            "deaths": _distribution([g["dead"] for g in games]),
+        })
+    return summary
+
+
+def run_batch(strategies, difficulties=None, games=100, seed=0,
+              engine="sparse", workers=None, map_name="Small", trace_dir=None,
+              series_dir=None):
+    if difficulties is None:
+        difficulties = list(DIFFICULTY_LEVELS)
+
+    tasks = []
+    for strategy in strategies:
+        for difficulty in difficulties:
+            for i in range(games):
+                tasks.append((strategy, difficulty, seed + i, engine, map_name,
+                              trace_dir, series_dir))
+
+    for path in (trace_dir, series_dir):
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        results = [_play_task(t) for t in tasks]
+    else:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_play_task, tasks, chunksize=chunksize))
+
+    return results, summarize(results)
+
+
+def print_summary(summary):
+    print(f"{'strategy':<12}{'difficulty':<10}{'games':>7}{'win %':>8}"
+          f"{'days (med)':>12}{'dead (mean)':>13}")
+    for row in summary:
+        days = row["days_to_victory"]
+        days_med = f"{days['median']:.0f}" if days else "-"
+        print(f"{row['strategy']:<12}{row['difficulty']:<10}{row['games']:>7}"
+              f"{100 * row['win_rate']:>7.1f}%{days_med:>12}"
+              f"{row['deaths']['mean']:>13.1f}")
+
+
+# ------------------------------------------------------------
+# ENTRY POINT
+# ------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Headless Monte Carlo runner")
+    parser.add_argument("--games", type=int, default=100,
+                        help="replicates per strategy and difficulty")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES))
+    parser.add_argument("--difficulties", default=",".join(DIFFICULTY_LEVELS))
+    parser.add_argument("--engine", default="sparse",
+                        choices=["python", "numpy", "sparse"])
+    parser.add_argument("--map", default="Small", choices=list(MAP_SIZES))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write per-game results and summary here")
+    parser.add_argument("--trace-dir",
+                        help="write each game's day-by-day history file here")
+    parser.add_argument("--series-dir",
+                        help="write each game's daily counts as CSV here")
+    args = parser.parse_args()
+
+    results, summary = run_batch(
+        args.strategies.split(","),
+        args.difficulties.split(","),
+        games=args.games,
+        seed=args.seed,
+        engine=args.engine,
+        workers=args.workers,
+        map_name=args.map,
+        trace_dir=args.trace_dir,
+        series_dir=args.series_dir,
+    )
+    print_summary(summary)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"summary": summary, "games": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+# ============================================================
+# parallel_sim.py — Tiled Multi-Core Stepping (Shared Memory)
+# ============================================================
+#
+# For maps of several million tiles. The grid lives in shared memory
+# as two buffers (today / tomorrow) and is split into row bands, one
+# per worker process. Each day every worker:
+#   1. waits at the start barrier
+#   2. reads its band plus a one-row halo above and below from
+#      today's buffer (the halo is the neighbour rows' tiles, so the
+#      exchange is just a read of shared memory)
+#   3. runs the vector_sim kernel and writes its band into tomorrow's
+#      buffer, plus its band's S/I/R/D/Q counts
+#   4. waits at the done barrier
+# then the buffers swap. A worker that raises aborts the barrier, and
+# a day that takes longer than `timeout` seconds (e.g. a killed
+# worker) breaks it, so step_day raises instead of waiting forever. The per-tile rules are exactly those of
+# vector_sim.step_array, so results are statistically equivalent to
+# the serial engine; only the random streams differ (one per worker).
+#
+#   python parallel_sim.py --rows 4000 --cols 4000 --max-workers 8
+
+import os
+import time
+import argparse
+import threading
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+from config import *
+from sim_rng import SimRandom
+from rates import DEFAULT_RATES
+from vector_sim import GRID_DTYPE, step_array
+
+
+_RUN = 0
+_STOP = 1
+
+DAY_TIMEOUT = 60.0      # seconds one day may take before it is abandoned
+
+
+def _bands(rows, n):
+    """Split rows into n contiguous (start, stop) bands."""
+    edges = np.linspace(0, rows, n + 1).astype(int)
+    return [(int(edges[i]), int(edges[i + 1])) for i in range(n)]
+
+
+def _attach(names, shape, dtype):
+    shms = [shared_memory.SharedMemory(name=name) for name in names]
+    arrays = [np.ndarray(shape, dtype=dtype, buffer=shm.buf) for shm in shms]
+    return shms, arrays
+
+
+# ------------------------------------------------------------
+# Worker process: steps one row band per day
+# ------------------------------------------------------------
+def _worker(index, names, shape, band, difficulty_mult, rng, rates,
+            barrier, command, current, timeout):
+    grid_shms, grids = _attach(names["grids"], shape, GRID_DTYPE)
+    mask_shms, (hospital, quarantine) = _attach(names["masks"], shape, bool)
+    count_shms, (counts,) = _attach([names["counts"]], (names["n"], 5), np.int64)
+
+    rows = shape[0]
+    r0, r1 = band
+    h0, h1 = max(r0 - 1, 0), min(r1 + 1, rows)
+
+    try:
+        while True:
+            # no timeout here: the coordinator may sit idle between days
+            barrier.wait()
+            if command.value == _STOP:
+                break
+
+            src = grids[current.value]
+            dst = grids[1 - current.value]
+
+            try:
+                out = step_array(src[h0:h1], difficulty_mult,
+                                 hospital[h0:h1], quarantine[h0:h1], rng,
+                                 rates=rates)
+                dst[r0:r1] = out[r0 - h0:r1 - h0]
+                counts[index] = np.bincount(dst[r0:r1].ravel(), minlength=5)[:5]
+            except BaseException:
+                barrier.abort()
+                raise
+
+            barrier.wait(timeout)
+    except threading.BrokenBarrierError:
+        pass        # the coordinator gave up on this day
+    finally:
+        del grids, hospital, quarantine, counts
+        for shm in grid_shms + mask_shms + count_shms:
+            shm.close()
+
+
+# ------------------------------------------------------------
+# Coordinator
+# ------------------------------------------------------------
+class ParallelStepper:
+    """
+    Owns the shared buffers and the worker pool. Use as a context
+    manager (or call close()) so the shared memory is released.
+    `rates` overrides the config.py disease rates (rates.DiseaseRates).
+    """
+
+    def __init__(self, grid, difficulty_mult, hospital_mask=None,
+                 quarantine_mask=None, workers=None, seed=None,
+                 rates=DEFAULT_RATES, timeout=DAY_TIMEOUT):
+        grid = np.asarray(grid, dtype=GRID_DTYPE)
+        self.shape = grid.shape
+        self.workers = max(1, min(workers or os.cpu_count() or 1, self.shape[0]))
+        self.day = 0
+        self.timeout = timeout
+
+        size = int(np.prod(self.shape))
+        self._shms = []
+
+        def alloc(nbytes):
+            shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+            self._shms.append(shm)
+            return shm
+
+        grid_shms = [alloc(size), alloc(size)]
+        mask_shms = [alloc(size), alloc(size)]
+        count_shm = alloc(self.workers * 5 * 8)
+
+        self._grids = [np.ndarray(self.shape, GRID_DTYPE, buffer=s.buf) for s in grid_shms]
+        self._hospital, self._quarantine = [
+            np.ndarray(self.shape, bool, buffer=s.buf) for s in mask_shms
+        ]
+        self._counts = np.ndarray((self.workers, 5), np.int64, buffer=count_shm.buf)
+
+        self._grids[0][:] = grid
+        # day 0's totals, so counts() is right before the first step
+        self._counts[:] = 0
+        self._counts[0] = np.bincount(grid.ravel(), minlength=5)[:5]
+        self.set_masks(hospital_mask, quarantine_mask)
+
+        ctx = mp.get_context("spawn")
+        self._barrier = ctx.Barrier(self.workers + 1)
+        self._command = ctx.Value("i", _RUN, lock=False)
+        self._current = ctx.Value("i", 0, lock=False)
+
+        names = {
+            "grids": [s.name for s in grid_shms],
+            "masks": [s.name for s in mask_shms],
+            "counts": count_shm.name,
+            "n": self.workers,
+        }
+        streams = SimRandom(seed).spawn(self.workers)
+        self._procs = [
+            ctx.Process(
+                target=_worker,
+                args=(i, names, self.shape, band, difficulty_mult, streams[i],
+                      rates, self._barrier, self._command, self._current,
+                      timeout),
+                daemon=True,
+            )
+            for i, band in enumerate(_bands(self.shape[0], self.workers))
+        ]
+        for p in self._procs:
+            p.start()
+
+    # ---------------------------------------------------------
+    # State access (only between days)
+    # ---------------------------------------------------------
+    @property
+    def grid(self):
+        return self._grids[self._current.value]
+
+    def set_masks(self, hospital_mask=None, quarantine_mask=None):
+        self._hospital[:] = False if hospital_mask is None else hospital_mask
+        self._quarantine[:] = False if quarantine_mask is None else quarantine_mask
+
+    def counts(self):
+        """Total [S, I, R, D, Q] after the last day (or of the start grid)."""
+        return self._counts.sum(axis=0)
+
+    # ---------------------------------------------------------
+    # Stepping
+    # ---------------------------------------------------------
+    def step_day(self):
+        if not all(p.is_alive() for p in self._procs):
+            self._barrier.abort()
+            raise RuntimeError("a parallel_sim worker has exited")
+        try:
+            self._barrier.wait(self.timeout)    # start: workers read today's buffer
+            self._barrier.wait(self.timeout)    # done: tomorrow's buffer is complete
+        except threading.BrokenBarrierError:
+            self._barrier.abort()
+            raise RuntimeError("a parallel_sim worker failed or timed out "
+                               f"on day {self.day + 1}") from None
+        self._current.value = 1 - self._current.value
+        self.day += 1
+        return self.counts()
+
+    def step_turn(self, days=10):
+        return np.stack([self.step_day() for _ in range(days)])
+
+    def close(self):
+        if self._procs:
+            self._command.value = _STOP
+            try:
+                self._barrier.wait(self.timeout)
+            except threading.BrokenBarrierError:
+                self._barrier.abort()   # workers still waiting bail out
+            for p in self._procs:
+                p.join(self.timeout)
+                if p.is_alive():
+                    p.terminate()
+                    p.join()
+            self._procs = []
+
+        self._grids = self._hospital = self._quarantine = self._counts = None
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+        self._shms = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ------------------------------------------------------------
+# Scaling measurement: 1 .. N workers vs the serial engine
+# ------------------------------------------------------------
+def measure_scaling(rows, cols, days=10, max_workers=None, seed=0):
+    max_workers = max_workers or os.cpu_count() or 1
+
+    # Seed a spread-out outbreak so every band has work to do
+    rng = SimRandom(seed)
+    grid = np.full((rows, cols), SUS, dtype=GRID_DTYPE)
+    grid[rng.random((rows, cols)) < 0.01] = INF
+    no_mask = np.zeros(grid.shape, dtype=bool)
+
+    results = []
+
+    start = time.perf_counter()
+    serial = grid
+    for _ in range(days):
+        serial = step_array(serial, 1.0, no_mask, no_mask, rng)
+    serial_time = (time.perf_counter() - start) / days
+    results.append({"workers": 0, "sec_per_day": serial_time, "speedup": 1.0})
+
+    n = 1
+    while True:
+        with ParallelStepper(grid, 1.0, workers=n, seed=seed) as stepper:
+            stepper.step_day()                    # warm-up
+            start = time.perf_counter()
+            stepper.step_turn(days)
+            per_day = (time.perf_counter() - start) / days
+        results.append({
+            "workers": n,
+            "sec_per_day": per_day,
+            "speedup": serial_time / per_day,
+        })
+        if n == max_workers:
+            break
+        n = min(n * 2, max_workers)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel stepping scaling test")
+    parser.add_argument("--rows", type=int, default=3000)
+    parser.add_argument("--cols", type=int, default=3000)
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--max-workers", type=int, default=None)
+    args = parser.parse_args()
+
+    print(f"{'workers':>8}{'sec/day':>12}{'speedup':>10}")
+    for row in measure_scaling(args.rows, args.cols, args.days, args.max_workers):
+        label = "serial" if row["workers"] == 0 else row["workers"]
+        print(f"{label:>8}{row['sec_per_day']:>12.4f}{row['speedup']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# ============================================================
+# population.py — Live S/I/R/D/Q Population Counters
+# ============================================================
+#
+# The simulation and tools report every tile they change, so the
+# current totals are always available in O(1) instead of scanning the
+# whole grid every frame.
+
+import numpy as np
+from config import *
+
+
+class PopulationTally:
+    def __init__(self, rows=GRID_ROWS, cols=GRID_COLS):
+        # index by state value: counts[SUS], counts[INF], ...
+        self.counts = [0] * 5
+        self.counts[SUS] = rows * cols
+
+    @classmethod
+    def from_grid(cls, grid):
+        if hasattr(grid, "shape"):
+            return cls.from_array(grid)
+        tally = cls(0, 0)
+        if hasattr(grid, "state_counts"):
+            # ByteGrid: one bytes.count per state
+            tally.counts = grid.state_counts()
+            return tally
+        for row in grid:
+            for state in row:
+                tally.counts[state] += 1
+        return tally
+
+    @classmethod
+    def from_array(cls, grid):
+        """Same as from_grid for a NumPy grid, in one bincount pass."""
+        tally = cls(0, 0)
+        tally.counts = np.bincount(grid.ravel(), minlength=5)[:5].tolist()
+        return tally
+
+    def move(self, old, new, n=1):
+        """n tiles changed from state `old` to state `new`."""
+        self.counts[old] -= n
+        self.counts[new] += n
+
+    @property
+    def susceptible(self):
+        return self.counts[SUS]
+
+    @property
+    def infected(self):
+        return self.counts[INF]
+
+    @property
+    def recovered(self):
+        return self.counts[REC]
+
+    @property
+    def dead(self):
+        return self.counts[DED]
+
+    @property
+    def quarantined(self):
+        return self.counts[QUA]
+
+    @property
+    def total(self):
+        return sum(self.counts)
@@ -0,0 +1,139 @@
+# ============================================================
+# profiler.py — Per-Phase Timing Spans & Trace Export
+# ============================================================
+#
+# Wrap a phase in `with PROFILER.span("name"):` to time it. While the
+# profiler is off a span is a shared do-nothing object, so the hooks
+# can stay in the game loop for free. While it is on:
+#   * every phase keeps a rolling average (shown by the sidebar HUD)
+#   * if tracing, every span is also kept as a Chrome trace event, and
+#     stop_trace() writes a JSON file that chrome://tracing, Perfetto
+#     or speedscope can open
+#
+# In game: F3 shows / hides the HUD, F4 starts / stops a trace. Spans
+# are recorded while either is on, so hiding the HUD mid-trace leaves
+# the trace running.
+
+import os
+import json
+import time
+import threading
+from collections import deque
+from config import *
+
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    def __init__(self, profiler, name, count):
+        self.profiler = profiler
+        self.name = name
+        self.count = count
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter(), self.count)
+        return False
+
+
+class Profiler:
+    def __init__(self, window=PROFILER_WINDOW, enabled=False):
+        self.window = window
+        self.enabled = enabled          # recording spans (HUD or trace)
+        self.hud = enabled
+        self.tracing = False
+        self.stats = {}                 # phase name -> recent ms (per count)
+        self.events = []                # Chrome trace events while tracing
+        self._origin = time.perf_counter()
+        self._frame_start = None
+
+    # ---------------------------------------------------------
+    # Recording
+    # ---------------------------------------------------------
+    def span(self, name, count=1):
+        """Time a block. `count` splits it (e.g. a 10-day turn -> per day)."""
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name, count)
+
+    def record(self, name, start, end, count=1):
+        ms = (end - start) * 1000
+        recent = self.stats.get(name)
+        if recent is None:
+            recent = self.stats[name] = deque(maxlen=self.window)
+        recent.append(ms / max(count, 1))
+
+        if self.tracing:
+            self.events.append({
+                "name": name,
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": {"count": count},
+            })
+
+    def end_frame(self):
+        """Call once per flip; the time between calls is the frame time."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self.record("frame", self._frame_start, now)
+        self._frame_start = now
+
+    def average(self, name):
+        recent = self.stats.get(name)
+        if not recent:
+            return None
+        return sum(recent) / len(recent)
+
+    # ---------------------------------------------------------
+    # Switches
+    # ---------------------------------------------------------
+    def toggle(self):
+        """Show / hide the HUD; a running trace keeps recording."""
+        self.hud = not self.hud
+        self.enabled = self.hud or self.tracing
+        self.stats.clear()
+        self._frame_start = None
+
+    def start_trace(self):
+        self.enabled = True
+        self.hud = True
+        self.tracing = True
+        self.events = []
+
+    def stop_trace(self, path=None):
+        """Stop tracing and write the events; returns the file path."""
+        self.tracing = False
+        self.enabled = self.hud
+        if path is None:
+            path = time.strftime("trace_%Y%m%d_%H%M%S.json")
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+        self.events = []
+        return path
+
+    def toggle_trace(self):
+        if self.tracing:
+            return self.stop_trace()
+        self.start_trace()
+        return None
+
+
+# Shared instance used by the game loop, scenes and animator
+PROFILER = Profiler(enabled=PROFILER_ENABLED)
@@ -0,0 +1,20 @@
+# ============================================================
+# rates.py — Disease Rates as One Value
+# ============================================================
+#
+# The simulation kernels normally use the rates from config.py. Any of
+# them also accepts rates=DiseaseRates(...) so a balancing sweep can
+# run other values side by side without touching the config module.
+
+from collections import namedtuple
+from config import *
+
+
+DiseaseRates = namedtuple(
+    "DiseaseRates",
+    ["infect", "recover", "death", "hospital_boost", "quarantine_reduction"],
+    defaults=[BASE_INFECT_RATE, BASE_RECOVER_RATE, BASE_DEATH_RATE,
+              HOSPITAL_BOOST, QUARANTINE_REDUCTION],
+)
+
+DEFAULT_RATES = DiseaseRates()
@@ -0,0 +1,90 @@
+# ============================================================
+# replay.py — Scrub Through a Recorded Game
+# ============================================================
+#
+#   python replay.py [history.psh]
+#
+# The history file is memory-mapped, so opening a long game is
+# instant and jumping to a day reads just that one frame.
+#
+#   , .          previous / next day
+#   PgUp PgDn    10 days back / forward
+#   Home End     first / last day
+#   wheel, arrows, WASD, right-drag   zoom and pan as in the game
+
+import sys
+import pygame
+from config import *
+from grid_logic import GridRenderer
+from camera import Camera
+from scene import run_scene
+from savegame import open_history
+
+
+STEP_KEYS = {
+    pygame.K_COMMA: -1,
+    pygame.K_PERIOD: 1,
+    pygame.K_PAGEUP: -10,
+    pygame.K_PAGEDOWN: 10,
+}
+
+
+def replay(screen, path):
+    frames = open_history(path)
+    days, rows, cols = frames.shape
+
+    camera = Camera(rows, cols)
+    renderer = GridRenderer(camera)
+    font = pygame.font.SysFont("segoeui", 26)
+    current = [days - 1]
+
+    def render():
+        frame = frames[current[0]]
+        renderer.draw(screen, frame)
+
+        # Sidebar: day and counts for this frame only
+        sidebar_x = VIEW_WIDTH
+        pygame.draw.rect(screen, (25, 25, 35),
+                         (sidebar_x, 0, SCREEN_WIDTH - sidebar_x, SCREEN_HEIGHT))
+        counts = [int((frame == s).sum()) for s in (INF, REC, DED)]
+        lines = [
+            (f"Day {current[0]} / {days - 1}", WHITE),
+            (f"Infected: {counts[0]}", (255, 80, 80)),
+            (f"Recovered: {counts[1]}", (80, 255, 80)),
+            (f"Dead: {counts[2]}", (130, 130, 130)),
+        ]
+        y = 40
+        for text, color in lines:
+            screen.blit(font.render(text, True, color), (sidebar_x + 25, y))
+            y += 50
+
+    def state():
+        return current[0], camera.state()
+
+    def handle(e):
+        if camera.handle_event(e):
+            return None
+        if e.type == pygame.KEYDOWN:
+            if e.key in STEP_KEYS:
+                current[0] = max(0, min(current[0] + STEP_KEYS[e.key], days - 1))
+            elif e.key == pygame.K_HOME:
+                current[0] = 0
+            elif e.key == pygame.K_END:
+                current[0] = days - 1
+            elif e.key == pygame.K_ESCAPE:
+                return True
+
+    run_scene(render, handle, state)
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else "history.psh"
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Pandemic Replay")
+    replay(screen, path)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
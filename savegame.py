@@ -0,0 +1,202 @@
+# ============================================================
+# savegame.py — Binary Snapshots & Memory-Mapped Day History
+# ============================================================
+#
+# Snapshot (.psg) — one game state, written atomically:
+#   header    magic, rows, cols, day, energy, #hospitals, #quarantines,
+#             meta length                       (little-endian ints)
+#   hospitals int32 (r, c) pairs
+#   quarantines int32 (r, c) pairs
+#   meta      UTF-8 JSON: difficulty, speed, map, RNG state, ...
+#   grid      rows * cols bytes, one state value per tile
+#
+# History (.psh) — append-only, one frame per simulated day:
+#   header    magic, rows, cols
+#   frames    rows * cols bytes each
+# Frames are fixed size, so open_history() maps the whole file as a
+# (days, rows, cols) array without reading it: jumping to any day of
+# a long game or batch trace touches only that frame's pages.
+
+import os
+import json
+import struct
+import numpy as np
+from config import *
+from sim_rng import SimRandom
+
+
+SAVE_MAGIC = b"PANDSAV1"
+HISTORY_MAGIC = b"PANDHIS1"
+
+_SAVE_HEADER = struct.Struct("<8sIIiiIII")
+_HISTORY_HEADER = struct.Struct("<8sII")
+
+
+# ------------------------------------------------------------
+# Snapshots
+# ------------------------------------------------------------
+def _pairs_bytes(pairs):
+    return np.asarray(pairs, dtype="<i4").reshape(-1, 2).tobytes()
+
+
+def save_game(path, grid, hospitals, quarantines, day, energy, rng=None,
+              **meta):
+    """
+    Write one snapshot. Extra keyword arguments (difficulty, speed,
+    map name, ...) go into the JSON meta block.
+    """
+    grid = np.asarray(grid, dtype=np.uint8)
+    rows, cols = grid.shape
+    if rng is not None:
+        meta["rng"] = rng.get_state()
+    meta_bytes = json.dumps(meta).encode("utf-8")
+
+    # Write next to the target and swap in, so a crash never leaves a
+    # half-written save behind
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_SAVE_HEADER.pack(SAVE_MAGIC, rows, cols, day, energy,
+                                  len(hospitals), len(quarantines),
+                                  len(meta_bytes)))
+        f.write(_pairs_bytes(hospitals))
+        f.write(_pairs_bytes(quarantines))
+        f.write(meta_bytes)
+        f.write(grid.tobytes())
+    os.replace(tmp, path)
+
+
+def load_game(path):
+    """
+    Returns a dict with grid (NumPy uint8 array), hospitals and
+    quarantines (lists of (r, c)), day, energy, rng (SimRandom or
+    None) and every meta key that was saved.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    magic, rows, cols, day, energy, n_hosp, n_quar, meta_len = \
+        _SAVE_HEADER.unpack_from(data)
+    if magic != SAVE_MAGIC:
+        raise ValueError(f"{path} is not a saved game")
+
+    pos = _SAVE_HEADER.size
+    pairs = []
+    for n in (n_hosp, n_quar):
+        arr = np.frombuffer(data, dtype="<i4", count=2 * n, offset=pos)
+        pairs.append([(int(r), int(c)) for r, c in arr.reshape(-1, 2)])
+        pos += arr.nbytes
+
+    meta = json.loads(data[pos:pos + meta_len].decode("utf-8"))
+    pos += meta_len
+
+    grid = np.frombuffer(data, dtype=np.uint8, count=rows * cols, offset=pos)
+    rng_state = meta.pop("rng", None)
+
+    return {
+        **meta,
+        "grid": grid.reshape(rows, cols).copy(),
+        "hospitals": pairs[0],
+        "quarantines": pairs[1],
+        "day": day,
+        "energy": energy,
+        "rng": SimRandom.from_state(rng_state) if rng_state else None,
+    }
+
+
+# ------------------------------------------------------------
+# Append-only day history
+# ------------------------------------------------------------
+class HistoryWriter:
+    """
+    Appends one frame per day. Feed it whole grids with append(), or
+    the per-day change lists of simulate_turn with append_changes()
+    (it keeps its own copy of the last frame to apply them to; call
+    sync() before a turn if tools changed the grid since). When
+    resuming, `keep` frames are kept and anything recorded after them
+    (days played past the last save) is dropped. With `max_bytes` the
+    file stops growing once the next frame would not fit; the days
+    before that still replay.
+    """
+
+    def __init__(self, path, grid, resume=False, keep=None, max_bytes=None):
+        self.path = path
+        self.frame = np.array(grid, dtype=np.uint8)
+        self.max_bytes = max_bytes
+        self.full = False
+        rows, cols = self.frame.shape
+
+        if resume and _history_shape(path) == (rows, cols):
+            self.file = open(path, "r+b")
+            if keep is not None:
+                self.file.truncate(min(os.path.getsize(path),
+                                       _HISTORY_HEADER.size + keep * rows * cols))
+            self.file.seek(0, os.SEEK_END)
+        else:
+            self.file = open(path, "wb")
+            self.file.write(_HISTORY_HEADER.pack(HISTORY_MAGIC, rows, cols))
+            self.append(self.frame)
+
+    def sync(self, grid):
+        """Pick up changes made between days (player tools)."""
+        self.frame[...] = np.asarray(grid, dtype=np.uint8)
+
+    def append(self, grid):
+        if self.full:
+            return
+        self.frame[...] = np.asarray(grid, dtype=np.uint8)
+        self._write_frame()
+
+    def append_changes(self, changes):
+        if self.full:
+            return
+        if hasattr(changes, "shape"):
+            self.frame[changes[:, 0], changes[:, 1]] = changes[:, 2]
+        else:
+            for (r, c, state) in changes:
+                self.frame[r, c] = state
+        self._write_frame()
+
+    def _write_frame(self):
+        if (self.max_bytes is not None
+                and self.file.tell() + self.frame.nbytes > self.max_bytes):
+            self.full = True
+            return
+        self.file.write(self.frame.tobytes())
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def _history_shape(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        head = f.read(_HISTORY_HEADER.size)
+    if len(head) < _HISTORY_HEADER.size:
+        return None
+    magic, rows, cols = _HISTORY_HEADER.unpack(head)
+    return (rows, cols) if magic == HISTORY_MAGIC else None
+
+
+def open_history(path):
+    """Read-only (days, rows, cols) memory map of a history file."""
+    shape = _history_shape(path)
+    if shape is None:
+        raise ValueError(f"{path} is not a history file")
+    rows, cols = shape
+
+    # A frame still being written by a live game is ignored
+    days = (os.path.getsize(path) - _HISTORY_HEADER.size) // (rows * cols)
+    return np.memmap(path, dtype=np.uint8, mode="r",
+                     offset=_HISTORY_HEADER.size, shape=(days, rows, cols))
+
+
+def history_counts(frames, start=0, stop=None):
+    """[S, I, R, D, Q] per day for frames[start:stop]."""
+    return np.stack([
+        np.bincount(frame.ravel(), minlength=5)[:5]
+        for frame in frames[start:stop]
+    ])
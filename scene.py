@@ -0,0 +1,89 @@
+# ============================================================
+# scene.py — Frame-Capped, Redraw-on-Change Scene Loop
+# ============================================================
+#
+# Menus and popups used to spin `while True` redrawing as fast as
+# possible. run_scene instead:
+#   * redraws only when the scene's state key changes
+#     (hover, energy, grid, ...)
+#   * sleeps in pygame.event.wait() while nothing is animating
+#   * caps the frame rate with pygame.time.Clock
+# so an idle menu uses close to zero CPU.
+
+import sys
+import pygame
+from config import *
+from profiler import PROFILER
+
+
+_NEVER_DRAWN = object()
+
+# Events that mean the window contents were lost and must be redrawn
+_EXPOSE_EVENTS = {
+    pygame.VIDEOEXPOSE,
+    getattr(pygame, "WINDOWEXPOSED", pygame.VIDEOEXPOSE),
+}
+
+
+def handle_profiler_keys(e):
+    """F3 toggles the timings HUD, F4 starts / stops a trace file."""
+    if e.type != pygame.KEYDOWN:
+        return False
+    if e.key == pygame.K_F3:
+        PROFILER.toggle()
+        return True
+    if e.key == pygame.K_F4:
+        path = PROFILER.toggle_trace()
+        if path is not None:
+            print(f"Trace written to {path}")
+        return True
+    return False
+
+
+def run_scene(render, handle_event, state=None, animating=None, fps=FPS_CAP):
+    """
+    render()          draws one full frame (no flip)
+    handle_event(e)   returns None to keep going, anything else to
+                      leave the scene with that value
+    state()           hashable snapshot of whatever affects the
+                      picture; a redraw happens only when it changes
+    animating()       True while the scene must keep ticking even
+                      without input
+    """
+    clock = pygame.time.Clock()
+    last_state = _NEVER_DRAWN
+
+    while True:
+        current = state() if state is not None else None
+        if current != last_state:
+            render()
+            pygame.display.flip()
+            PROFILER.end_frame()
+            last_state = current
+
+        with PROFILER.span("wait"):
+            if animating is not None and animating():
+                events = pygame.event.get()
+            else:
+                # Block until something happens (with a wake-up so the
+                # state key is still polled now and then)
+                events = [pygame.event.wait(IDLE_WAKE_MS)]
+                events += pygame.event.get()
+
+        with PROFILER.span("events"):
+            for e in events:
+                if e.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if e.type in _EXPOSE_EVENTS:
+                    last_state = _NEVER_DRAWN
+                if handle_profiler_keys(e):
+                    last_state = _NEVER_DRAWN
+                    continue
+
+                result = handle_event(e)
+                if result is not None:
+                    return result
+
+        with PROFILER.span("wait"):
+            clock.tick(fps)
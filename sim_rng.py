@@ -0,0 +1,89 @@
+# ============================================================
+# sim_rng.py — Seeded, Bulk-Drawn Random Streams
+# ============================================================
+#
+# Every engine takes an explicit SimRandom instead of rolling on the
+# global `random` module, so a game is reproducible from its seed and
+# parallel workers never share a stream.
+#
+#   rng = SimRandom(seed)        one stream per game
+#   rng.take(n)                  n uniforms as a Python list, drawn in
+#                                one NumPy call (per-cell engines)
+#   rng.random(shape)            NumPy array of uniforms (vector engines)
+#   rng.random()                 one uniform, served from a bulk buffer
+#   rng.spawn(n)                 n independent child streams, one per
+#                                replicate or worker
+
+import numpy as np
+
+
+class SimRandom:
+    def __init__(self, seed=None, buffer_size=4096):
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_seq = seed
+        else:
+            self.seed_seq = np.random.SeedSequence(seed)
+        self.generator = np.random.default_rng(self.seed_seq)
+        self.buffer_size = buffer_size
+        self._buffer = []
+        self._pos = 0
+
+    @property
+    def seed(self):
+        """Entropy the stream was built from (log it to replay a game)."""
+        return self.seed_seq.entropy
+
+    # ---------------------------------------------------------
+    # Drawing
+    # ---------------------------------------------------------
+    def random(self, size=None):
+        """Like np.random.Generator.random; a scalar comes from the buffer."""
+        if size is not None:
+            return self.generator.random(size)
+
+        if self._pos >= len(self._buffer):
+            self._buffer = self.generator.random(self.buffer_size).tolist()
+            self._pos = 0
+        value = self._buffer[self._pos]
+        self._pos += 1
+        return value
+
+    def take(self, n):
+        """n uniforms in [0, 1) as a plain list (cheap to index per cell)."""
+        return self.generator.random(n).tolist()
+
+    # ---------------------------------------------------------
+    # Save / restore (plain JSON-able dict, used by savegame)
+    # ---------------------------------------------------------
+    def get_state(self):
+        return {
+            "entropy": self.seed_seq.entropy,
+            "spawn_key": list(self.seed_seq.spawn_key),
+            "bit_generator": self.generator.bit_generator.state,
+            "buffer": self._buffer[self._pos:],
+            "buffer_size": self.buffer_size,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        seed_seq = np.random.SeedSequence(state["entropy"],
+                                          spawn_key=tuple(state["spawn_key"]))
+        rng = cls(seed_seq, state["buffer_size"])
+        rng.generator.bit_generator.state = state["bit_generator"]
+        rng._buffer = list(state["buffer"])
+        return rng
+
+    # ---------------------------------------------------------
+    # Independent child streams
+    # ---------------------------------------------------------
+    def spawn(self, n):
+        return [SimRandom(child, self.buffer_size) for child in self.seed_seq.spawn(n)]
+
+
+def ensure_rng(rng=None):
+    """
+    `rng`, or a new stream seeded from OS entropy when the caller passed
+    none. Never a shared module-level stream: forked workers inherit
+    its state and would all draw the same numbers.
+    """
+    return rng if rng is not None else SimRandom()
@@ -0,0 +1,240 @@
+# ============================================================
+# simulation.py — Disease Simulation Core (no pygame)
+# ============================================================
+#
+# Grid creation, the per-day infection rules and the whole-turn loop.
+# Nothing here imports pygame, so headless runners (monte_carlo,
+# benchmarks, batch workers) start without a display, audio device or
+# font setup. grid_logic re-exports these names for the game.
+
+import numpy as np
+from config import *
+from coverage import CoverageIndex
+from population import PopulationTally
+from sim_rng import ensure_rng
+from rates import DEFAULT_RATES
+from bytegrid import ByteGrid, copy_grid
+
+
+# -------------------------------------------------------------------
+# Create initial empty grid (all susceptible)
+# -------------------------------------------------------------------
+def make_grid(rows=GRID_ROWS, cols=GRID_COLS):
+    # one byte per tile; grid[r][c] reads and writes as with nested lists
+    return ByteGrid(rows, cols, SUS)
+
+
+# -------------------------------------------------------------------
+# Win / loss check
+# -------------------------------------------------------------------
+def check_end_conditions(grid, tally=None):
+    if tally is None:
+        tally = PopulationTally.from_grid(grid)
+
+    if tally.infected == 0:
+        return "VICTORY! Infection eliminated."
+
+    total_cells = tally.total
+    infected_count = tally.infected
+
+    if infected_count == total_cells:
+        return "DEFEAT! Entire map infected."
+
+    return None
+
+# -------------------------------------------------------------------
+# Count infected neighbors
+# -------------------------------------------------------------------
+def count_infected_neighbors(grid, r, c):
+    neighbors = [
+        (-1, 0), (1, 0), (0, -1), (0, 1),
+        (-1, -1), (-1, 1), (1, -1), (1, 1)
+    ]
+    count = 0
+    for dr, dc in neighbors:
+        nr = r + dr
+        nc = c + dc
+        if 0 <= nr < len(grid) and 0 <= nc < len(grid[0]):
+            if grid[nr][nc] == INF:
+                count += 1
+    return count
+
+
+# -------------------------------------------------------------------
+# Hospital detection near a tile
+# -------------------------------------------------------------------
+def hospital_near(hospitals, r, c):
+    for hr, hc in hospitals:
+        if abs(hr - r) <= 2 and abs(hc - c) <= 2:
+            return True
+    return False
+
+
+# -------------------------------------------------------------------
+# Quarantine zone detection
+# -------------------------------------------------------------------
+def in_quarantine(qzones, r, c):
+    for (qr, qc) in qzones:
+        # quarantine = 3x3 area (
+        if abs(qr - r) <= 1 and abs(qc - c) <= 1:
+            return True
+    return False
+
+
+# -------------------------------------------------------------------
+# One day of transitions, as a list of (r, c, new_state)
+# -------------------------------------------------------------------
+def _day_changes(grid, difficulty_mult, coverage, rng, rates=DEFAULT_RATES):
+    rows = len(grid)
+    cols = len(grid[0])
+
+    # Every tile rolls at most twice: draw the whole day up front
+    roll = iter(rng.take(2 * rows * cols)).__next__
+
+    changes = []
+    for r in range(rows):
+        for c in range(cols):
+            state = grid[r][c]
+
+            # Dead stays dead
+            if state == DED:
+                continue
+
+            # Quarantine stays a static zone
+            if state == QUA:
+                continue
+
+            # Recovery from INF
+            if state == INF:
+                recover_rate = rates.recover
+                death_rate = rates.death
+
+                # Hospitals help nearby tiles
+                recover_rate += coverage.recover_boost(r, c, rates)
+
+                if roll() < recover_rate:
+                    changes.append((r, c, REC))
+                    continue
+
+                # Death check
+                if roll() < death_rate:
+                    changes.append((r, c, DED))
+                    continue
+
+            # Infection spread (only if susceptible)
+            if state == SUS:
+                neighbors = count_infected_neighbors(grid, r, c)
+                if neighbors > 0:
+
+                    spread_rate = rates.infect * difficulty_mult
+
+                    # quarantine reduces spread
+                    spread_rate *= coverage.spread_factor(r, c, rates)
+
+                    # multiple neighbors = more chance
+                    spread_chance = 1 - (1 - spread_rate)**neighbors
+
+                    if roll() < spread_chance:
+                        changes.append((r, c, INF))
+
+    return changes
+
+
+def apply_changes(grid, changes, tally=None):
+    """
+    Write a day's (r, c, new_state) transitions into `grid`: a list of
+    tuples, or the (k, 3) array the NumPy engine reports.
+    """
+    if hasattr(changes, "shape") and hasattr(grid, "__array__"):
+        # NumPy grid or ByteGrid (whose array view shares its memory)
+        target = np.asarray(grid)
+        rows, cols, states = changes[:, 0], changes[:, 1], changes[:, 2]
+        if tally is not None:
+            moves = np.bincount(target[rows, cols] * 5 + states, minlength=25)
+            for pair in np.flatnonzero(moves):
+                tally.move(int(pair) // 5, int(pair) % 5, int(moves[pair]))
+        target[rows, cols] = states
+        return
+
+    for (r, c, state) in changes:
+        if tally is not None:
+            tally.move(grid[r][c], state)
+        grid[r][c] = state
+
+
+# -------------------------------------------------------------------
+# MAIN SIMULATION: runs 1 day
+# -------------------------------------------------------------------
+def simulate_day(grid, difficulty_mult, hospitals, qzones, coverage=None,
+                 tally=None, rng=None, rates=DEFAULT_RATES):
+    new_grid = copy_grid(grid)
+
+    # hospital / quarantine influence per tile, read in O(1) below
+    coverage = default_coverage(grid, hospitals, qzones, coverage)
+    rng = ensure_rng(rng)
+
+    apply_changes(new_grid,
+                  _day_changes(grid, difficulty_mult, coverage, rng, rates),
+                  tally)
+    return new_grid
+
+
+# -------------------------------------------------------------------
+# WHOLE TURN: runs `days` days, updating `grid` in place
+# -------------------------------------------------------------------
+def default_coverage(grid, hospitals, qzones, coverage=None):
+    """`coverage`, or a CoverageIndex built from the structure lists."""
+    if coverage is None:
+        coverage = CoverageIndex.from_structures(len(grid), len(grid[0]),
+                                                 hospitals, qzones)
+    return coverage
+
+
+def run_turn(grid, step, days=10, tally=None, rng=None, history=False,
+             on_day=None):
+    """
+    The day loop behind every engine's simulate_turn. step(rng, tally,
+    report) advances `grid` one day in place and, when report is set,
+    returns that day's changes (a list or (k, 3) array). Defaults,
+    records and on_day work as described in simulate_turn.
+    """
+    rng = ensure_rng(rng)
+    report = history or on_day is not None
+    if tally is None and report:
+        tally = PopulationTally.from_grid(grid)
+
+    records = [] if history else None
+    for _ in range(days):
+        changes = step(rng, tally, report)
+
+        if report:
+            counts = tuple(tally.counts)
+            if history:
+                records.append((counts, changes))
+            if on_day is not None:
+                on_day(counts, changes)
+
+    return records
+
+
+def simulate_turn(grid, difficulty_mult, hospitals, qzones, days=10,
+                  coverage=None, tally=None, rng=None, history=False,
+                  on_day=None, rates=DEFAULT_RATES):
+    """
+    Each day's transitions are collected while reading `grid`, then
+    written back in one go, so no per-day grid copy is ever made.
+
+    on_day(counts, changes) is called after every day, where counts is
+    a copy of the S/I/R/D/Q tally and changes that day's
+    (r, c, new_state) list. With history=True the same (counts,
+    changes) pairs are also returned as a list. `rates` overrides the
+    config.py disease rates (see rates.DiseaseRates).
+    """
+    coverage = default_coverage(grid, hospitals, qzones, coverage)
+
+    def step(rng, tally, report):
+        changes = _day_changes(grid, difficulty_mult, coverage, rng, rates)
+        apply_changes(grid, changes, tally)
+        return changes
+
+    return run_turn(grid, step, days, tally, rng, history, on_day)
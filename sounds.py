@@ -0,0 +1,81 @@
+# ============================================================
+# sounds.py — Sound Effects & Music, Loaded on Demand
+# ============================================================
+#
+# Nothing is decoded at import time. Each effect is loaded the first
+# time it is played, or all of them on a background thread once
+# preload() is called (main() does this while the start screen is up).
+# If no audio device can be opened the game simply stays silent.
+
+import threading
+import pygame
+
+
+SOUND_FILES = {
+    "vaccine": "sounds/vaccine.wav",
+    "quarantine": "sounds/quarantine.wav",
+    "hospital": "sounds/hospital.wav",
+    "click": "sounds/click.wav",
+    "victory": "sounds/victory.wav",
+    "defeat": "sounds/defeat.wav",
+}
+MUSIC_FILE = "sounds/soundtrack.mp3"
+MUSIC_VOLUME = 0.4
+
+
+class SoundBank:
+    def __init__(self, files=SOUND_FILES):
+        self.files = dict(files)
+        self.sounds = {}
+        self.lock = threading.Lock()
+        self.available = None       # unknown until the mixer is first needed
+
+    def _mixer_ready(self):
+        if self.available is None:
+            try:
+                if not pygame.mixer.get_init():
+                    pygame.mixer.init()
+                self.available = True
+            except pygame.error:
+                self.available = False
+        return self.available
+
+    def get(self, name):
+        """The decoded Sound for `name` (None when there is no audio)."""
+        with self.lock:
+            sound = self.sounds.get(name)
+            if sound is None and self._mixer_ready():
+                sound = self.sounds[name] = pygame.mixer.Sound(self.files[name])
+        return sound
+
+    def play(self, name):
+        sound = self.get(name)
+        if sound is not None:
+            sound.play()
+
+    def preload(self):
+        """Decode every effect on a daemon thread; returns the thread."""
+        if not self._mixer_ready():
+            return None
+        thread = threading.Thread(
+            target=lambda: [self.get(name) for name in self.files],
+            name="sound-preload", daemon=True
+        )
+        thread.start()
+        return thread
+
+    # ---------------------------------------------------------
+    # Background music (streamed by the mixer, not decoded here)
+    # ---------------------------------------------------------
+    def play_music(self, path=MUSIC_FILE, volume=MUSIC_VOLUME, loops=-1):
+        if self._mixer_ready():
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.play(loops)
+
+    def pause_music(self):
+        if self.available:
+            pygame.mixer.music.pause()
+
+
+SOUNDS = SoundBank()
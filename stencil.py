@@ -0,0 +1,55 @@
+# ============================================================
+# stencil.py — Precomputed Disk Stencils for Radius Actions
+# ============================================================
+#
+# A radius action (the vaccine, or anything added later) affects the
+# tiles whose top-left corner lies within `radius` pixels of the
+# target tile's corner at `cell_size` pixels per tile. Those tiles are
+# the same for every target, so the (dr, dc) offsets are computed
+# once per (radius, cell_size) and then just shifted and clipped to
+# the map edges. Applying an action costs O(stencil), not O(map).
+
+from functools import lru_cache
+import numpy as np
+from config import *
+
+
+@lru_cache(maxsize=None)
+def disk_offsets(radius, cell_size=CELL_SIZE):
+    """Tuple of (dr, dc) with (dr*cell_size)^2 + (dc*cell_size)^2 <= radius^2."""
+    reach = int(radius // cell_size)
+    limit = radius * radius
+    return tuple(
+        (dr, dc)
+        for dr in range(-reach, reach + 1)
+        for dc in range(-reach, reach + 1)
+        if (dr * cell_size) ** 2 + (dc * cell_size) ** 2 <= limit
+    )
+
+
+@lru_cache(maxsize=None)
+def disk_arrays(radius, cell_size=CELL_SIZE):
+    """Same offsets as two read-only int arrays (drs, dcs)."""
+    offsets = np.array(disk_offsets(radius, cell_size), dtype=np.intp).reshape(-1, 2)
+    drs, dcs = offsets[:, 0].copy(), offsets[:, 1].copy()
+    drs.flags.writeable = False
+    dcs.flags.writeable = False
+    return drs, dcs
+
+
+def stencil_cells(r, c, rows, cols, radius, cell_size=CELL_SIZE):
+    """Yield the in-map (rr, cc) tiles covered by the stencil at (r, c)."""
+    for dr, dc in disk_offsets(radius, cell_size):
+        rr = r + dr
+        cc = c + dc
+        if 0 <= rr < rows and 0 <= cc < cols:
+            yield rr, cc
+
+
+def stencil_index(r, c, shape, radius, cell_size=CELL_SIZE):
+    """(rows, cols) index arrays of the covered tiles, for NumPy grids."""
+    drs, dcs = disk_arrays(radius, cell_size)
+    rr = drs + r
+    cc = dcs + c
+    inside = (rr >= 0) & (rr < shape[-2]) & (cc >= 0) & (cc < shape[-1])
+    return rr[inside], cc[inside]
@@ -0,0 +1,299 @@
+# ============================================================
+# sweep.py — Parallel Parameter Sweep & Sensitivity Analysis
+# ============================================================
+#
+# Plays headless games (monte_carlo.play_game) over a design of
+# disease-rate settings and aggregates the outcomes per point:
+#
+#   python sweep.py --param infect=0.12:0.24:4 --param recover=0.05:0.09:3
+#   python sweep.py --lhs 64 --param infect=0.12:0.24 --param death=0.02:0.05
+#
+# lo:hi:n sweeps n evenly spaced values and the points are every
+# combination; with --lhs N the points are an N-point Latin hypercube
+# over the lo:hi bounds instead. Parameters not given keep their
+# config.py value. Every point plays the same game seeds, so outcome
+# differences come from the parameters rather than the dice.
+#
+# Points run across a process pool. Each finished point is appended to
+# the --checkpoint file as one JSON line, and rerunning the same
+# command skips the points already there, so an interrupted sweep
+# picks up where it stopped.
+
+import os
+import json
+import argparse
+import itertools
+import statistics
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from config import *
+from rates import DiseaseRates
+from monte_carlo import STRATEGIES, play_game
+
+
+# Sweepable parameter -> config.py default
+PARAMETERS = {
+    "infect": BASE_INFECT_RATE,
+    "recover": BASE_RECOVER_RATE,
+    "death": BASE_DEATH_RATE,
+    "hospital_boost": HOSPITAL_BOOST,
+    "quarantine_reduction": QUARANTINE_REDUCTION,
+    "difficulty": DIFFICULTY_LEVELS["Normal"],
+}
+
+METRICS = ("win_rate", "days", "dead", "recovered", "peak_infected", "peak_day")
+
+
+# ------------------------------------------------------------
+# Designs
+# ------------------------------------------------------------
+def parse_param(text):
+    """'name=lo:hi[:n]' -> (name, lo, hi, n or None)."""
+    name, _, spec = text.partition("=")
+    if name not in PARAMETERS:
+        raise ValueError(f"unknown parameter {name!r} "
+                         f"(choose from {', '.join(PARAMETERS)})")
+    parts = spec.split(":")
+    if len(parts) not in (2, 3):
+        raise ValueError(f"expected {name}=lo:hi or {name}=lo:hi:n, got {text!r}")
+    lo, hi = float(parts[0]), float(parts[1])
+    n = int(parts[2]) if len(parts) == 3 else None
+    return name, lo, hi, n
+
+
+def grid_design(specs):
+    """Every combination of n evenly spaced values per parameter."""
+    axes = []
+    for name, lo, hi, n in specs:
+        axes.append([(name, float(v)) for v in np.linspace(lo, hi, n or 3)])
+    return [dict(combo) for combo in itertools.product(*axes)]
+
+
+def lhs_design(specs, n, seed=0):
+    """
+    n points where each parameter's range is cut into n equal strata
+    and every stratum is used exactly once (Latin hypercube).
+    """
+    rng = np.random.default_rng(seed)
+    points = [{} for _ in range(n)]
+    for name, lo, hi, _ in specs:
+        strata = (rng.permutation(n) + rng.random(n)) / n
+        for point, u in zip(points, strata):
+            point[name] = float(lo + u * (hi - lo))
+    return points
+
+
+def point_settings(params):
+    """(DiseaseRates, difficulty multiplier) for one design point."""
+    values = {**PARAMETERS, **params}
+    rates = DiseaseRates(
+        infect=values["infect"],
+        recover=values["recover"],
+        death=values["death"],
+        hospital_boost=values["hospital_boost"],
+        quarantine_reduction=values["quarantine_reduction"],
+    )
+    return rates, values["difficulty"]
+
+
+# ------------------------------------------------------------
+# One point (runs in a worker process)
+# ------------------------------------------------------------
+def run_point(index, params, settings):
+    rates, diff_mult = point_settings(params)
+    games = [
+        play_game(settings["strategy"], diff_mult, settings["seed"] + i,
+                  engine=settings["engine"], map_name=settings["map"],
+                  rates=rates, track_peak=True)
+        for i in range(settings["games"])
+    ]
+
+    metrics = {
+        "win_rate": sum(g["result"] == "victory" for g in games) / len(games),
+    }
+    for key in METRICS[1:]:
+        metrics[key] = statistics.fmean(g[key] for g in games)
+
+    return {"point": index, "params": params, "settings": settings,
+            "metrics": metrics}
+
+
+# ------------------------------------------------------------
+# Checkpoint file (one JSON line per finished point)
+# ------------------------------------------------------------
+def load_checkpoint(path, points, settings):
+    """{point index: record} of the points already finished in `path`."""
+    done = {}
+    if path is None or not os.path.exists(path):
+        return done
+
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue        # a line cut off by the interruption
+            index = record["point"]
+            if (record["settings"] != settings or index >= len(points)
+                    or record["params"] != points[index]):
+                raise ValueError(f"{path} belongs to a different sweep; "
+                                 "use a new --checkpoint file")
+            done[index] = record
+    return done
+
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def run_sweep(points, settings, workers=None, checkpoint=None, progress=None):
+    """Records for every point, in design order."""
+    done = load_checkpoint(checkpoint, points, settings)
+    todo = [i for i in range(len(points)) if i not in done]
+
+    out = None
+    if checkpoint is not None:
+        out = open(checkpoint, "a")
+        # finish a line torn by the interruption before appending
+        if out.tell() > 0 and not _ends_with_newline(checkpoint):
+            out.write("\n")
+    try:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_point, i, points[i], settings) for i in todo]
+            for future in as_completed(futures):
+                record = future.result()
+                done[record["point"]] = record
+                if out is not None:
+                    out.write(json.dumps(record) + "\n")
+                    out.flush()
+                if progress is not None:
+                    progress(len(done), len(points))
+    finally:
+        if out is not None:
+            out.close()
+
+    return [done[i] for i in range(len(points))]
+
+
+# ------------------------------------------------------------
+# Sensitivity: rank correlation of each parameter with each metric
+# ------------------------------------------------------------
+def _ranks(values):
+    """Ranks with ties averaged."""
+    values = np.asarray(values, dtype=float)
+    ranks = np.empty(len(values))
+    ranks[values.argsort(kind="stable")] = np.arange(len(values))
+    _, inverse = np.unique(values, return_inverse=True)
+    return (np.bincount(inverse, ranks) / np.bincount(inverse))[inverse]
+
+
+def spearman(x, y):
+    """Spearman rank correlation, or None if either side is constant."""
+    rx, ry = _ranks(x), _ranks(y)
+    if rx.std() == 0 or ry.std() == 0:
+        return None
+    return float(np.corrcoef(rx, ry)[0, 1])
+
+
+def sensitivity(records, names):
+    return {
+        name: {
+            metric: spearman([r["params"][name] for r in records],
+                             [r["metrics"][metric] for r in records])
+            for metric in METRICS
+        }
+        for name in names
+    }
+
+
+# ------------------------------------------------------------
+# Output
+# ------------------------------------------------------------
+def print_points(records, names):
+    print("".join(f"{n:>12}" for n in names)
+          + "".join(f"{m:>14}" for m in METRICS))
+    for r in records:
+        print("".join(f"{r['params'][n]:>12.4f}" for n in names)
+              + "".join(f"{r['metrics'][m]:>14.2f}" for m in METRICS))
+
+
+def print_sensitivity(table):
+    print(f"{'spearman':<22}" + "".join(f"{m:>14}" for m in METRICS))
+    for name, row in table.items():
+        cells = "".join(
+            f"{'-':>14}" if row[m] is None else f"{row[m]:>14.2f}"
+            for m in METRICS
+        )
+        print(f"{name:<22}{cells}")
+
+
+def write_csv(path, records, names):
+    with open(path, "w", newline="") as f:
+        f.write(",".join(list(names) + list(METRICS)) + "\n")
+        for r in records:
+            row = [r["params"][n] for n in names] + [r["metrics"][m] for m in METRICS]
+            f.write(",".join(str(v) for v in row) + "\n")
+
+
+# ------------------------------------------------------------
+# ENTRY POINT
+# ------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Disease-rate parameter sweep")
+    parser.add_argument("--param", action="append", required=True,
+                        help="name=lo:hi[:n], repeatable; names: "
+                             + ", ".join(PARAMETERS))
+    parser.add_argument("--lhs", type=int,
+                        help="Latin hypercube of this many points instead of a grid")
+    parser.add_argument("--games", type=int, default=20, help="games per point")
+    parser.add_argument("--strategy", default="nothing", choices=list(STRATEGIES))
+    parser.add_argument("--engine", default="sparse",
+                        choices=["python", "numpy", "sparse"])
+    parser.add_argument("--map", default="Small", choices=list(MAP_SIZES))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--checkpoint", help="JSON-lines file of finished points")
+    parser.add_argument("--json", help="write every point and the sensitivity table")
+    parser.add_argument("--csv", help="write one row per point")
+    args = parser.parse_args()
+
+    try:
+        specs = [parse_param(p) for p in args.param]
+    except ValueError as exc:
+        parser.error(str(exc))
+    names = [s[0] for s in specs]
+
+    if args.lhs:
+        points = lhs_design(specs, args.lhs, args.seed)
+    else:
+        points = grid_design(specs)
+
+    settings = {"strategy": args.strategy, "games": args.games,
+                "seed": args.seed, "engine": args.engine, "map": args.map}
+
+    def progress(done, total):
+        print(f"\r{done}/{total} points", end="", flush=True)
+
+    records = run_sweep(points, settings, args.workers, args.checkpoint, progress)
+    print()
+
+    table = sensitivity(records, names)
+    print_points(records, names)
+    print()
+    print_sensitivity(table)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"points": records, "sensitivity": table}, f, indent=2)
+    if args.csv:
+        write_csv(args.csv, records, names)
+
+
+if __name__ == "__main__":
+    main()
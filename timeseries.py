@@ -0,0 +1,92 @@
+# ============================================================
+# timeseries.py — Per-Day S/I/R/D/Q Epidemic Curve Recorder
+# ============================================================
+#
+# The simulation hands every day's tally to append(), so the curve
+# costs five integers per day and never a grid scan. Rows live in a
+# preallocated int32 array that doubles when full. Optionally every
+# row is also streamed to a CSV file as it arrives, so a long game or
+# a batch of games can be exported without holding anything extra.
+
+import numpy as np
+from config import *
+
+
+CSV_HEADER = "day,susceptible,infected,recovered,dead,quarantined\n"
+
+
+class TimeSeries:
+    def __init__(self, capacity=256, first_day=0):
+        self.counts = np.zeros((capacity, 5), dtype=np.int32)
+        self.length = 0
+        self.first_day = first_day      # game day of row 0
+        self.csv = None
+
+    @classmethod
+    def from_counts(cls, rows):
+        """A series pre-filled with (days, 5) counts, e.g. history_counts()."""
+        rows = np.asarray(rows, dtype=np.int32).reshape(-1, 5)
+        series = cls(max(256, 2 * len(rows)))
+        series.counts[:len(rows)] = rows
+        series.length = len(rows)
+        return series
+
+    def __len__(self):
+        return self.length
+
+    # ---------------------------------------------------------
+    # Recording
+    # ---------------------------------------------------------
+    def append(self, counts):
+        """Record one day's [S, I, R, D, Q] counts."""
+        if self.length == len(self.counts):
+            grown = np.zeros((2 * len(self.counts), 5), dtype=np.int32)
+            grown[:self.length] = self.counts
+            self.counts = grown
+
+        self.counts[self.length] = counts[:5]
+        if self.csv is not None:
+            self.csv.write(f"{self.first_day + self.length},{counts[SUS]},{counts[INF]},"
+                           f"{counts[REC]},{counts[DED]},{counts[QUA]}\n")
+        # bump length last: readers on another thread only see full rows
+        self.length += 1
+
+    # ---------------------------------------------------------
+    # Reading
+    # ---------------------------------------------------------
+    def view(self):
+        """(days, 5) view of the recorded rows (no copy)."""
+        return self.counts[:self.length]
+
+    def column(self, state):
+        return self.counts[:self.length, state]
+
+    def peak(self, state=INF):
+        """(day, count) of the highest value of one state."""
+        if self.length == 0:
+            return None
+        col = self.column(state)
+        day = int(col.argmax())
+        return day, int(col[day])
+
+    # ---------------------------------------------------------
+    # Streaming CSV export
+    # ---------------------------------------------------------
+    def stream_csv(self, path):
+        """
+        Write the rows recorded so far to `path`, then every future
+        append() as it happens.
+        """
+        self.csv = open(path, "w", newline="")
+        self.csv.write(CSV_HEADER)
+        for day, row in enumerate(self.view().tolist(), self.first_day):
+            self.csv.write(f"{day}," + ",".join(map(str, row)) + "\n")
+
+    def flush(self):
+        if self.csv is not None:
+            self.csv.flush()
+
+    def close(self):
+        if self.csv is not None:
+            self.csv.close()
+            self.csv = None
@@ -3,28 +3,39 @@
 # ============================================================
 
 from config import *
-import math
+from stencil import stencil_cells, stencil_index
 
 
 # -------------------------------------------------------------
 # Apply Vaccine — converts infected → recovered, and
 # boosts immunity in a radius.
+# Only the tiles under the cached disk stencil are visited.
 # -------------------------------------------------------------
-def place_vaccine(grid, r, c):
+def place_vaccine(grid, r, c, tally=None):
 
-    for rr in range(GRID_ROWS):
-        for cc in range(GRID_COLS):
+    # NumPy grids: the whole stencil in one fancy-indexing pass
+    if hasattr(grid, "shape"):
+        rr, cc = stencil_index(r, c, grid.shape, VACCINE_RADIUS)
+        states = grid[rr, cc]
+        infected = states == INF
+        susceptible = states == SUS
+        if tally is not None:
+            tally.move(INF, REC, int(infected.sum()))
+            tally.move(SUS, REC, int(susceptible.sum()))
+        grid[rr[infected | susceptible], cc[infected | susceptible]] = REC
+        return grid
 
-            dx = (cc - c) * CELL_SIZE
-            dy = (rr - r) * CELL_SIZE
-
-            if math.sqrt(dx*dx + dy*dy) <= VACCINE_RADIUS:
-                # Infecteds recover
-                if grid[rr][cc] == INF:
-                    grid[rr][cc] = REC
-                # Susceptible turn immune
-                elif grid[rr][cc] == SUS:
-                    grid[rr][cc] = REC
+    for rr, cc in stencil_cells(r, c, len(grid), len(grid[0]), VACCINE_RADIUS):
+        # Infecteds recover
+        if grid[rr][cc] == INF:
+            grid[rr][cc] = REC
+            if tally is not None:
+                tally.move(INF, REC)
+        # Susceptible turn immune
+        elif grid[rr][cc] == SUS:
+            grid[rr][cc] = REC
+            if tally is not None:
+                tally.move(SUS, REC)
 
     return grid
 
@@ -32,24 +43,31 @@ def place_vaccine(grid, r, c):
 # -------------------------------------------------------------
 # Place Quarantine — sets a 3×3 zone of QUA tiles
 # -------------------------------------------------------------
-def place_quarantine(qzones, r, c):
+def place_quarantine(qzones, r, c, coverage=None):
     """
     qzones stores the CENTER (r,c) of each quarantine zone.
-    We do NOT change the grid tiles — grid_logic checks qzones.
+    We do NOT change the grid tiles — grid_logic checks qzones
+    (or the CoverageIndex, which is stamped here when given).
     """
     qzones.append((r, c))
+    if coverage is not None:
+        coverage.add_quarantine(r, c)
 
 
 # -------------------------------------------------------------
 # Place Hospital — adds a healing structure
 # -------------------------------------------------------------
-def place_hospital(grid, hospitals, r, c):
+def place_hospital(grid, hospitals, r, c, coverage=None, tally=None):
     """
     hospitals stores the tile of each hospital so simulate_day()
     can boost recovery around them.
     """
     hospitals.append((r, c))
+    if coverage is not None:
+        coverage.add_hospital(r, c)
 
     # Draw a visible plus symbol by marking the tile recovered
     if grid[r][c] != DED:
+        if tally is not None:
+            tally.move(grid[r][c], REC)
         grid[r][c] = REC
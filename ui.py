@@ -3,7 +3,10 @@
 # ============================================================
 
 import pygame
+from collections import OrderedDict
 from config import *
+from scene import run_scene
+from profiler import PROFILER
 
 # -----------------------------------------------------------
 # Tooltip descriptions for turn menu
@@ -20,11 +23,72 @@ ACTION_DESCRIPTIONS = {
 # ------------------------------------------------------------
 # Fonts & Colors
 # ------------------------------------------------------------
-pygame.font.init()
+class LazyFont:
+    """
+    Stands in for a pygame Font. The SysFont lookup (a scan of the
+    system's fonts) happens on first use, not when ui is imported.
+    """
 
-FONT = pygame.font.SysFont("segoeui", 26)
-FONT_BIG = pygame.font.SysFont("segoeui", 48, bold=True)
-FONT_SMALL = pygame.font.SysFont("segoeui", 20)
+    def __init__(self, name, size, bold=False):
+        # underscored so they never shadow Font.size() / Font.bold
+        self._name = name
+        self._size = size
+        self._bold = bold
+        self._font = None
+
+    def __getattr__(self, attr):
+        # only reached for Font attributes: render, size, get_height, ...
+        if self._font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self._font = pygame.font.SysFont(self._name, self._size, bold=self._bold)
+        return getattr(self._font, attr)
+
+
+FONT = LazyFont("segoeui", 26)
+FONT_BIG = LazyFont("segoeui", 48, bold=True)
+FONT_SMALL = LazyFont("segoeui", 20)
+
+
+# ------------------------------------------------------------
+# Text surface cache
+# ------------------------------------------------------------
+class TextCache:
+    """
+    Rendered text surfaces keyed by (font, text, color), least recently
+    used dropped first. Labels that repeat every frame are rasterized
+    once; a sidebar number is re-rendered only when it changes.
+    """
+
+    def __init__(self, maxsize=TEXT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+        self.misses = 0
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        with PROFILER.span("text"):
+            surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_text(font, text, color):
+    return TEXT_CACHE.render(font, str(text), color)
 
 WHITE = (245, 245, 245)
 GRAY = (160, 160, 160)
@@ -43,6 +107,10 @@ class Button:
         self.text = text
         self.hovered = False
 
+        # Label rasterized once; redone only if `text` is changed
+        self._label_text = text
+        self.label = render_text(FONT, text, WHITE)
+
     def update_hover(self, mouse_pos):
         self.hovered = self.rect.collidepoint(mouse_pos)
 
@@ -54,7 +122,11 @@ class Button:
         pygame.draw.rect(screen, color, self.rect, border_radius=10)
         pygame.draw.rect(screen, DARK, self.rect, 3, border_radius=10)
 
-        label = FONT.render(self.text, True, WHITE)
+        if self.text != self._label_text:
+            self._label_text = self.text
+            self.label = render_text(FONT, self.text, WHITE)
+
+        label = self.label
         screen.blit(label, (
             self.rect.centerx - label.get_width() // 2,
             self.rect.centery - label.get_height() // 2
@@ -68,8 +140,8 @@ def draw_selected_button(screen, button):
 # ============================================================
 # STATS SIDEBAR
 # ============================================================
-def draw_stats(screen, infected, recovered, dead, energy, day):
-    sidebar_x = GRID_COLS * CELL_SIZE
+def draw_stats(screen, infected, recovered, dead, energy, day, chart=None):
+    sidebar_x = VIEW_WIDTH
 
     pygame.draw.rect(
         screen, DARK,
@@ -79,7 +151,7 @@ def draw_stats(screen, infected, recovered, dead, energy, day):
     y = 40
 
     # Title
-    header = FONT_BIG.render("Stats", True, WHITE)
+    header = render_text(FONT_BIG, "Stats", WHITE)
     screen.blit(header, (sidebar_x + 25, y))
     y += 90
 
@@ -91,142 +163,315 @@ def draw_stats(screen, infected, recovered, dead, energy, day):
         ("Energy", f"{energy}/{MAX_ENERGY}", BLUE)
     ]
 
+    # Labels are cached for good; a value is only re-rendered when it changes
     for label, value, color in stats:
-        line = FONT.render(f"{label}: {value}", True, color)
-        screen.blit(line, (sidebar_x + 25, y))
+        label = render_text(FONT, f"{label}: ", color)
+        screen.blit(label, (sidebar_x + 25, y))
+        screen.blit(render_text(FONT, value, color),
+                    (sidebar_x + 25 + label.get_width(), y))
         y += 50
 
+    # The timings HUD (F3) takes the chart's place while it is on
+    if PROFILER.hud:
+        draw_perf_hud(screen, sidebar_x + 25, y + 10)
+    elif chart is not None:
+        chart.draw(screen, sidebar_x + 20, y + 10)
+
+
+# ============================================================
+# EPIDEMIC CHART
+# ============================================================
+class EpidemicChart:
+    """
+    Stacked S/I/R/D share of the population, one column per day, read
+    from a timeseries.TimeSeries. Only days not yet painted are drawn
+    onto the kept surface; once it is full the surface scrolls left,
+    so the chart is never redrawn from scratch.
+    """
+
+    # bottom to top
+    LAYERS = (
+        (DED, COLOR_DEAD),
+        (INF, COLOR_INFECTED),
+        (REC, COLOR_RECOVERED),
+        (SUS, COLOR_SUSCEPTIBLE),
+    )
+
+    def __init__(self, width=SCREEN_WIDTH - VIEW_WIDTH - 40,
+                 height=CHART_HEIGHT, day_px=CHART_DAY_PX):
+        self.surface = pygame.Surface((width, height))
+        self.day_px = day_px
+        self.columns = width // day_px
+        self.reset()
+
+    def reset(self):
+        self.surface.fill(DARK)
+        self.days = 0
+
+    def _paint(self, x, counts):
+        height = self.surface.get_height()
+        total = int(counts.sum()) or 1
+
+        # layer edges from cumulative counts, so rounding never leaves gaps
+        y = height
+        below = 0
+        for state, color in self.LAYERS:
+            below += int(counts[state])
+            top = height - below * height // total
+            if top < y:
+                self.surface.fill(color, (x, top, self.day_px, y - top))
+                y = top
+        if y > 0:
+            self.surface.fill(DARK, (x, 0, self.day_px, y))
+
+    def update(self, series, upto=None):
+        """Paint days [painted, upto) of the series (default: all)."""
+        upto = len(series) if upto is None else min(upto, len(series))
+        if upto < self.days:
+            self.reset()
+        if upto == self.days:
+            return
+
+        # first day still on the chart, before and after this update
+        old_first = max(0, self.days - self.columns)
+        new_first = max(0, upto - self.columns)
+        shift = new_first - old_first
+        if shift >= self.columns:
+            self.surface.fill(DARK)
+        elif shift:
+            self.surface.scroll(-shift * self.day_px, 0)
+
+        rows = series.counts
+        for day in range(max(self.days, new_first), upto):
+            self._paint((day - new_first) * self.day_px, rows[day])
+        self.days = upto
+
+    def draw(self, screen, x, y):
+        screen.blit(self.surface, (x, y))
+        pygame.draw.rect(screen, GRAY, self.surface.get_rect(topleft=(x, y)), 1)
+
+
+# ============================================================
+# PERFORMANCE HUD (F3)
+# ============================================================
+HUD_ROWS = [
+    ("frame", "Frame"),
+    ("simulate", "Sim / day"),
+    ("draw_grid", "Grid draw"),
+    ("draw_stats", "Stats draw"),
+    ("events", "Events"),
+    ("tool", "Tool"),
+    ("text", "Text render"),
+]
+
+
+def draw_perf_hud(screen, x, y):
+    # timings change every frame, so these bypass the text cache
+    for name, label in HUD_ROWS:
+        ms = PROFILER.average(name)
+        value = "-" if ms is None else f"{ms:.2f} ms"
+        line = FONT_SMALL.render(f"{label}: {value}", True, GRAY)
+        screen.blit(line, (x, y))
+        y += 22
+
+    if PROFILER.tracing:
+        line = FONT_SMALL.render(f"REC trace ({len(PROFILER.events)})", True, (255, 80, 80))
+        screen.blit(line, (x, y))
+
 
 # ============================================================
 # START GAME SCREEN
 # ============================================================
-def draw_start_screen(screen):
+def draw_start_screen(screen, can_resume=False):
+    """Returns "start", or "resume" if a saved game was picked."""
 
     start_btn = Button(SCREEN_WIDTH//2 - 150, 430, 300, 60, "Start Game")
+    resume_btn = Button(SCREEN_WIDTH//2 - 150, 510, 300, 60, "Resume Game")
+    buttons = [start_btn, resume_btn] if can_resume else [start_btn]
+
+    def state():
+        # Hover effect
+        mpos = pygame.mouse.get_pos()
+        for b in buttons:
+            b.update_hover(mpos)
+        return tuple(b.hovered for b in buttons)
 
-    while True:
+    def render():
         screen.fill(DARK)
 
-        title = FONT_BIG.render("Pandemic Strategy Game", True, WHITE)
+        title = render_text(FONT_BIG, "Pandemic Strategy Game", WHITE)
         screen.blit(title, (
             SCREEN_WIDTH//2 - title.get_width()//2,
             180
         ))
 
-        # Hover effect
-        mpos = pygame.mouse.get_pos()
-        start_btn.update_hover(mpos)
+        for b in buttons:
+            b.draw(screen)
 
-        start_btn.draw(screen)
-        pygame.display.flip()
+    def handle(e):
+        if e.type == pygame.MOUSEBUTTONDOWN:
+            if start_btn.clicked(e.pos):
+                return "start"  # continue to settings screen
+            if can_resume and resume_btn.clicked(e.pos):
+                return "resume"
 
-        for e in pygame.event.get():
-            if e.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            if e.type == pygame.MOUSEBUTTONDOWN:
-                if start_btn.clicked(e.pos):
-                    return  # continue to settings screen
+    return run_scene(render, handle, state)
 
 
 # ============================================================
-# DIFFICULTY + SPEED SCREEN
+# MAP SIZE + DIFFICULTY + SPEED SCREEN
 # ============================================================
 def draw_settings_screen(screen):
 
+    # Map size buttons (Small is preselected)
+    map_buttons = {
+        name: Button(SCREEN_WIDTH//2 - 230 + i*160, 125, 140, 55, name)
+        for i, name in enumerate(MAP_SIZES)
+    }
+
     # Difficulty buttons
     diff_buttons = {
-        "Easy": Button(SCREEN_WIDTH//2 - 150, 300, 300, 55, "Easy"),
-        "Normal": Button(SCREEN_WIDTH//2 - 150, 360, 300, 55, "Normal"),
-        "Hard": Button(SCREEN_WIDTH//2 - 150, 420, 300, 55, "Hard"),
+        "Easy": Button(SCREEN_WIDTH//2 - 150, 230, 300, 55, "Easy"),
+        "Normal": Button(SCREEN_WIDTH//2 - 150, 290, 300, 55, "Normal"),
+        "Hard": Button(SCREEN_WIDTH//2 - 150, 350, 300, 55, "Hard"),
     }
 
     # Corrected speed buttons
     speed_buttons = {
-        "0.5x": Button(SCREEN_WIDTH//2 - 150, 530, 140, 55, "0.5x"),
-        "1x":   Button(SCREEN_WIDTH//2 + 10, 530, 140, 55, "1x")
+        "0.5x": Button(SCREEN_WIDTH//2 - 150, 450, 140, 55, "0.5x"),
+        "1x":   Button(SCREEN_WIDTH//2 + 10, 450, 140, 55, "1x")
     }
 
-    chosen_difficulty = None
-    chosen_speed = None
+    # Nothing starts until this is clicked, so every choice can be made
+    # (or changed) in any order
+    start_button = Button(SCREEN_WIDTH//2 - 150, 525, 300, 55, "Start Game")
+
+    all_buttons = (
+        list(map_buttons.values())
+        + list(diff_buttons.values())
+        + list(speed_buttons.values())
+        + [start_button]
+    )
+
+    chosen = {"map": "Small", "difficulty": None, "speed": None}
 
-    while True:
+    def state():
+        # Hover states
+        mpos = pygame.mouse.get_pos()
+        for b in all_buttons:
+            b.update_hover(mpos)
+
+        hovered = tuple(b.hovered for b in all_buttons)
+        return hovered, chosen["map"], chosen["difficulty"], chosen["speed"]
+
+    def render():
         screen.fill(DARK)
 
         # Titles
-        title = FONT_BIG.render("Choose Difficulty & Speed", True, WHITE)
-        screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 180))
+        title = render_text(FONT_BIG, "Choose Map, Difficulty & Speed", WHITE)
+        screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 30))
 
-        diff_label = FONT.render("Difficulty:", True, WHITE)
-        screen.blit(diff_label, (SCREEN_WIDTH//2 - diff_label.get_width()//2, 255))
+        map_label = render_text(FONT, "Map Size:", WHITE)
+        screen.blit(map_label, (SCREEN_WIDTH//2 - map_label.get_width()//2, 90))
 
-        speed_label = FONT.render("Game Speed:", True, WHITE)
-        screen.blit(speed_label, (SCREEN_WIDTH//2 - speed_label.get_width()//2, 490))
+        diff_label = render_text(FONT, "Difficulty:", WHITE)
+        screen.blit(diff_label, (SCREEN_WIDTH//2 - diff_label.get_width()//2, 195))
 
-        # Hover states
-        mpos = pygame.mouse.get_pos()
-        for b in diff_buttons.values():
-            b.update_hover(mpos)
-        for b in speed_buttons.values():
-            b.update_hover(mpos)
+        speed_label = render_text(FONT, "Game Speed:", WHITE)
+        screen.blit(speed_label, (SCREEN_WIDTH//2 - speed_label.get_width()//2, 415))
+
+        # Draw map size buttons
+        for name, b in map_buttons.items():
+            b.draw(screen)
+            if chosen["map"] == name:
+                draw_selected_button(screen, b)
 
         # Draw difficulty buttons
         for name, b in diff_buttons.items():
             b.draw(screen)
-            if chosen_difficulty == name:
+            if chosen["difficulty"] == name:
                 draw_selected_button(screen, b)
 
         # Draw speed buttons
         for name, b in speed_buttons.items():
             b.draw(screen)
-            if chosen_speed == name:
+            if chosen["speed"] == name:
                 draw_selected_button(screen, b)
 
-        pygame.display.flip()   
+        # Start is outlined once difficulty and speed are both picked
+        start_button.draw(screen)
+        if chosen["difficulty"] and chosen["speed"]:
+            draw_selected_button(screen, start_button)
 
-        # Click detection
-        for e in pygame.event.get():
-            if e.type == pygame.QUIT:
-                pygame.quit()
-                exit()
+    # Click detection
+    def handle(e):
+        if e.type == pygame.MOUSEBUTTONDOWN:
 
-            if e.type == pygame.MOUSEBUTTONDOWN:
+            # Map size
+            for name, b in map_buttons.items():
+                if b.clicked(e.pos):
+                    chosen["map"] = name
 
-                # Difficulty
-                for name, b in diff_buttons.items():
-                    if b.clicked(e.pos):
-                        chosen_difficulty = name
+            # Difficulty
+            for name, b in diff_buttons.items():
+                if b.clicked(e.pos):
+                    chosen["difficulty"] = name
 
-                # Speed
-                for name, b in speed_buttons.items():
-                    if b.clicked(e.pos):
-                        chosen_speed = name
+            # Speed
+            for name, b in speed_buttons.items():
+                if b.clicked(e.pos):
+                    chosen["speed"] = name
 
-                # If both chosen, return
-                if chosen_difficulty and chosen_speed:
-                    return chosen_difficulty, chosen_speed
+            # Start, once difficulty and speed are both chosen
+            if (start_button.clicked(e.pos)
+                    and chosen["difficulty"] and chosen["speed"]):
+                return chosen["difficulty"], chosen["speed"], chosen["map"]
+
+    return run_scene(render, handle, state)
 # ============================================================
 # TURN ACTION POPUP
 # ============================================================
-def draw_turn_popup(screen, buttons, energy):
+POPUP_RECT = pygame.Rect(SCREEN_WIDTH//2 - 250, 180, 500, 420)
+_POPUP_PANEL = []
 
-    # Semi-transparent overlay
-    popup = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-    pygame.draw.rect(
-        popup,
-        POP_BG,
-        (SCREEN_WIDTH//2 - 250, 180, 500, 420),
-        border_radius=22
-    )
-    screen.blit(popup, (0, 0))
 
-    # Title
-    title = FONT_BIG.render("Choose an Action", True, WHITE)
-    screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 210))
+def popup_panel():
+    """The semi-transparent rounded panel, composited once and reused."""
+    if not _POPUP_PANEL:
+        panel = pygame.Surface(POPUP_RECT.size, pygame.SRCALPHA)
+        pygame.draw.rect(panel, POP_BG, panel.get_rect(), border_radius=22)
+        _POPUP_PANEL.append(panel)
+    return _POPUP_PANEL[0]
+
+
+def _draw_popup_static(surface, energy):
+    # Panel, title and energy: nothing here changes while the popup is open
+    surface.blit(popup_panel(), POPUP_RECT.topleft)
+
+    title = render_text(FONT_BIG, "Choose an Action", WHITE)
+    surface.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 210))
+
+    energy_label = render_text(FONT, f"Energy: {energy}/{MAX_ENERGY}", BLUE)
+    surface.blit(energy_label, (SCREEN_WIDTH//2 - energy_label.get_width()//2, 260))
+
+
+def popup_backdrop(screen, energy):
+    """
+    Freeze what is on screen now (grid + sidebar) with the static part
+    of the popup drawn over it. While the popup stays open each frame
+    is then this one blit plus the buttons.
+    """
+    backdrop = screen.copy()
+    _draw_popup_static(backdrop, energy)
+    return backdrop
+
+
+def draw_turn_popup(screen, buttons, energy, backdrop=None):
 
-    # Energy
-    energy_label = FONT.render(f"Energy: {energy}/{MAX_ENERGY}", True, BLUE)
-    screen.blit(energy_label, (SCREEN_WIDTH//2 - energy_label.get_width()//2, 260))
+    if backdrop is not None:
+        screen.blit(backdrop, (0, 0))
+    else:
+        _draw_popup_static(screen, energy)
 
     # ------------------------------
     # UPDATE HOVER STATES
@@ -249,7 +494,7 @@ def draw_turn_popup(screen, buttons, energy):
     # ------------------------------
     if hover_key:
         desc = ACTION_DESCRIPTIONS.get(hover_key, "")
-        tooltip = FONT_SMALL.render(desc, True, WHITE)
+        tooltip = render_text(FONT_SMALL, desc, WHITE)
         rect = tooltip.get_rect()
         rect.centerx = SCREEN_WIDTH // 2
         rect.top = 550  
@@ -0,0 +1,172 @@
+# ============================================================
+# vector_sim.py — NumPy Simulation Engine
+# ============================================================
+#
+# Same SUS/INF/REC/DED/QUA rules as simulation.simulate_day, but the
+# grid is a NumPy array and every step is done in bulk:
+#   * infected neighbours are counted with one shifted-sum pass
+#   * recovery / death / infection are computed as boolean masks
+#   * all random numbers for the day are drawn as a single array
+#
+# Every function works on the last two axes, so a stack of grids
+# shaped (..., rows, cols) is stepped exactly like a single grid.
+
+import numpy as np
+from config import *
+from sim_rng import ensure_rng
+from rates import DEFAULT_RATES
+from coverage import stamp_mask
+from simulation import run_turn
+
+
+GRID_DTYPE = np.uint8
+
+
+# -------------------------------------------------------------------
+# Create initial empty grid (all susceptible)
+# -------------------------------------------------------------------
+def make_grid_array(rows=GRID_ROWS, cols=GRID_COLS):
+    return np.full((rows, cols), SUS, dtype=GRID_DTYPE)
+
+
+def as_grid_array(grid):
+    """Accept a list-of-lists grid or an array and return an array."""
+    return np.asarray(grid, dtype=GRID_DTYPE)
+
+
+# -------------------------------------------------------------------
+# Count infected neighbours (8-neighbourhood, no wrap-around)
+# -------------------------------------------------------------------
+def count_infected_neighbors_array(grid):
+    inf = (grid == INF).astype(np.uint8)
+
+    pad_width = [(0, 0)] * (inf.ndim - 2) + [(1, 1), (1, 1)]
+    padded = np.pad(inf, pad_width)
+
+    rows, cols = inf.shape[-2:]
+    counts = np.zeros(inf.shape, dtype=np.uint8)
+    for dr in (0, 1, 2):
+        for dc in (0, 1, 2):
+            if dr == 1 and dc == 1:
+                continue
+            counts += padded[..., dr:dr + rows, dc:dc + cols]
+    return counts
+
+
+# -------------------------------------------------------------------
+# Boolean mask of every tile within `reach` of one of the centers
+# -------------------------------------------------------------------
+def structure_mask(shape, centers, reach):
+    mask = np.zeros(shape, dtype=bool)
+    for (r, c) in centers:
+        stamp_mask(mask, r, c, reach)
+    return mask
+
+
+def structure_masks(shape, hospitals, qzones, coverage=None):
+    """(hospital, quarantine) masks, from `coverage` when one is kept."""
+    if coverage is not None:
+        return coverage.masks()
+    return (structure_mask(shape, hospitals, HOSPITAL_REACH),
+            structure_mask(shape, qzones, QUARANTINE_REACH))
+
+
+# -------------------------------------------------------------------
+# Spread chance lookup: [in_quarantine, infected_neighbours]
+# -------------------------------------------------------------------
+def spread_chance_table(difficulty_mult, rates=DEFAULT_RATES):
+    spread_rate = rates.infect * difficulty_mult
+    spread = np.array([spread_rate, spread_rate * (1 - rates.quarantine_reduction)])
+    neighbors = np.arange(9)
+    return 1 - (1 - spread[:, None]) ** neighbors[None, :]
+
+
+# -------------------------------------------------------------------
+# Core kernel: one day, given precomputed influence masks
+# -------------------------------------------------------------------
+def step_array(grid, difficulty_mult, hospital_mask, quarantine_mask, rng=None,
+               tally=None, out=None, rates=DEFAULT_RATES):
+    """Returns tomorrow's grid, written into `out` if one is given."""
+    rng = ensure_rng(rng)
+
+    # One draw per day: [0] recovery / infection roll, [1] death roll
+    rolls = rng.random((2,) + grid.shape)
+
+    infected = grid == INF
+    susceptible = grid == SUS
+
+    # Recovery from INF (hospitals help nearby tiles)
+    recover_rate = np.where(hospital_mask, rates.recover + rates.hospital_boost,
+                            rates.recover)
+    recovers = infected & (rolls[0] < recover_rate)
+
+    # Death check only for those that did not recover
+    dies = infected & ~recovers & (rolls[1] < rates.death)
+
+    # Infection spread (only if susceptible with infected neighbours)
+    neighbors = count_infected_neighbors_array(grid)
+    table = spread_chance_table(difficulty_mult, rates)
+    chance = table[quarantine_mask.astype(np.intp), neighbors]
+    catches = susceptible & (neighbors > 0) & (rolls[0] < chance)
+
+    if out is None:
+        new_grid = grid.copy()
+    else:
+        new_grid = out
+        new_grid[...] = grid
+    new_grid[recovers] = REC
+    new_grid[dies] = DED
+    new_grid[catches] = INF
+
+    if tally is not None:
+        tally.move(INF, REC, int(recovers.sum()))
+        tally.move(INF, DED, int(dies.sum()))
+        tally.move(SUS, INF, int(catches.sum()))
+    return new_grid
+
+
+# -------------------------------------------------------------------
+# MAIN SIMULATION: runs 1 day (drop-in for simulation.simulate_day)
+# -------------------------------------------------------------------
+def simulate_day_array(grid, difficulty_mult, hospitals, qzones, coverage=None,
+                       tally=None, rng=None, rates=DEFAULT_RATES):
+    grid = as_grid_array(grid)
+    hospital_mask, quarantine_mask = structure_masks(grid.shape, hospitals,
+                                                     qzones, coverage)
+    return step_array(grid, difficulty_mult, hospital_mask, quarantine_mask,
+                      rng, tally, rates=rates)
+
+
+# -------------------------------------------------------------------
+# WHOLE TURN: runs `days` days in place with two alternating buffers
+# (same contract as simulation.simulate_turn)
+# -------------------------------------------------------------------
+def change_list(before, after):
+    """(k, 3) array of (r, c, new_state) for every tile that changed."""
+    cells = np.argwhere(before != after)
+    states = after[cells[:, 0], cells[:, 1]]
+    return np.column_stack((cells, states)).astype(np.int32)
+
+
+def simulate_turn_array(grid, difficulty_mult, hospitals, qzones, days=10,
+                        coverage=None, tally=None, rng=None, history=False,
+                        on_day=None, rates=DEFAULT_RATES):
+    hospital_mask, quarantine_mask = structure_masks(grid.shape, hospitals,
+                                                     qzones, coverage)
+
+    # [front, back]: each day reads the front buffer and writes the back
+    buffers = [grid, np.empty_like(grid)]
+
+    def step(rng, tally, report):
+        front, back = buffers
+        step_array(front, difficulty_mult, hospital_mask, quarantine_mask,
+                   rng, tally, out=back, rates=rates)
+        buffers.reverse()
+        return change_list(front, back) if report else None
+
+    records = run_turn(grid, step, days, tally, rng, history, on_day)
+
+    # After an odd number of days the result sits in the spare buffer
+    if buffers[0] is not grid:
+        grid[...] = buffers[0]
+    return records